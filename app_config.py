@@ -0,0 +1,64 @@
+"""
+app_config.py:
+
+This module holds the objects the whole ingest tool shares: the YAML
+ configuration and the file screening instance. Both are created on
+   first use, so importing a module never loads them.
+
+Functions:
+    get_yaml_data():
+        Returns the YAML configuration, loaded once per process.
+
+    get_file_screen():
+        Returns the ingest_file_screening instance shared by the main
+        window and the tables.
+
+Usage:
+    yaml_data = get_yaml_data()
+    headers = yaml_data["Table"]["Plate"]["table_head"]
+    sequences = get_file_screen().sequence_index.get(file_name)
+"""
+
+
+import threading
+
+
+_lock = threading.RLock()
+_yaml_data = None
+_file_screen = None
+
+
+def get_yaml_data():
+    """
+    Return the YAML configuration of the tool.
+
+    Returns:
+        dict: The data of ConfigTableView().load_yaml_data(), loaded on the first call.
+    """
+    global _yaml_data
+    with _lock:
+        if _yaml_data is None:
+            from utils.config import ConfigTableView
+
+            _yaml_data = ConfigTableView().load_yaml_data()
+        return _yaml_data
+
+
+def get_file_screen():
+    """
+    Return the shared file screening instance.
+
+    The screening module pulls in OpenCV, fileseq and the ShotGrid
+    department list, so it is only imported when the first delivery is
+    screened or pasted.
+
+    Returns:
+        ingest_file_screening: The instance shared by every caller.
+    """
+    global _file_screen
+    with _lock:
+        if _file_screen is None:
+            from file_screen import ingest_file_screening
+
+            _file_screen = ingest_file_screening(get_yaml_data())
+        return _file_screen
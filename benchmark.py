@@ -0,0 +1,836 @@
+"""
+benchmark.py:
+
+Stand-alone benchmarks for the ingest tool. Every benchmark builds its own
+synthetic data, so none of them needs a real delivery or a ShotGrid site.
+
+Usage:
+    python benchmark.py scan --shots 200 --frames 200
+    python benchmark.py classify --names 100000
+    python benchmark.py versions --records 200000 --rows 1000
+    python benchmark.py version-query --records 200000 --rows 50 --latency 0.02
+    python benchmark.py startup --module main --history startup_history.jsonl
+    python benchmark.py deadline-status --jobs 500
+    python benchmark.py compression --frames 20 --frame-size 8 --bandwidth 100
+    python benchmark.py table --rows 50000 --legacy-rows 2000
+"""
+
+
+import argparse
+import json
+import os
+import random
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import zlib
+
+from collections import Counter
+
+
+# A "Table" config shaped like the production ingest YAML
+SYNTHETIC_TABLES = {
+    "UnMatched": {"regex": "None", "filter": None, "extensions": []},
+    "Plate": {
+        "regex": r"[a-zA-Z]{2}[0-9]{1,4}",
+        "filter": ["plate", "bg", "fg", "el"],
+        "extensions": ["exr", "dpx", "tif"],
+    },
+    "Annotations": {
+        "regex": "None",
+        "filter": ["annotation", "note", "ann"],
+        "extensions": ["jpg", "jpeg", "png"],
+    },
+    "Reference": {
+        "regex": "None",
+        "filter": ["ref", "reference"],
+        "extensions": ["pdf", "txt", "xlsx"],
+    },
+    "Movs": {"regex": "None", "filter": ["mov"], "extensions": ["mov", "mp4"]},
+}
+
+
+def timed(func, *args, repeat=3, **kwargs):
+    """
+    Run a function a few times and return its best wall time and last result.
+
+    Args:
+        func (callable): The function to benchmark.
+        repeat (int): The number of runs.
+
+    Returns:
+        tuple: (best_seconds, result)
+    """
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def make_synthetic_delivery(root, shots, frames):
+    """
+    Create an empty-file delivery tree laid out like a vendor plate delivery.
+
+    Args:
+        root (str): The directory to create the delivery in.
+        shots (int): The number of shot folders.
+        frames (int): The number of frames in every plate sequence.
+
+    Returns:
+        str: The delivery root path.
+    """
+    delivery = os.path.join(root, "delivery")
+    for shot_index in range(shots):
+        shot = "sq010_sh{:04d}".format((shot_index + 1) * 10)
+        plate_dir = os.path.join(delivery, shot, "plate")
+        os.makedirs(plate_dir)
+        for frame in range(1001, 1001 + frames):
+            open(os.path.join(plate_dir, f"{shot}_bg01.{frame}.exr"), "w").close()
+        open(os.path.join(delivery, shot, f"{shot}_ref.mov"), "w").close()
+    return delivery
+
+
+def bench_scan(args):
+    import fileseq
+
+    from file_scan import ScanStats, walk_sequences
+
+    def legacy_scan(source_path):
+        found = []
+        for root, dirs, files in os.walk(source_path):
+            found.extend(str(seq) for seq in fileseq.findSequencesOnDisk(root))
+        return found
+
+    def single_pass_scan(source_path, stats=None):
+        found = []
+        for root, sequences in walk_sequences(source_path, stats):
+            found.extend(str(seq) for seq in sequences)
+        return found
+
+    temp_dir = tempfile.mkdtemp(prefix="ingest_bench_")
+    try:
+        delivery = make_synthetic_delivery(temp_dir, args.shots, args.frames)
+        legacy_time, legacy_result = timed(legacy_scan, delivery, repeat=args.repeat)
+        scan_time, scan_result = timed(single_pass_scan, delivery, repeat=args.repeat)
+        stats = ScanStats()
+        single_pass_scan(delivery, stats)
+        directories = sum(1 for _ in os.walk(delivery))
+    finally:
+        shutil.rmtree(temp_dir)
+
+    assert legacy_result == scan_result, "single pass scan differs from os.walk scan"
+    print(f"sequences          : {len(scan_result)}")
+    print(f"directories        : {directories}")
+    print(f"directory listings : {stats['directory_listings']}")
+    print(f"os.walk + fileseq  : {legacy_time:.3f}s")
+    print(f"single pass scan   : {scan_time:.3f}s")
+    print(f"speed up           : {legacy_time / scan_time:.2f}x")
+
+
+def make_synthetic_names(count, seed=1):
+    """
+    Build (filename, is_sequence) pairs covering every table rule.
+
+    Args:
+        count (int): The number of names.
+        seed (int): The random seed.
+
+    Returns:
+        list: (filename, is_sequence) tuples.
+    """
+    rng = random.Random(seed)
+    stems = ["bg01", "fg02", "plate", "annotation", "notes", "ref", "lens_grid", "cleanup"]
+    extensions = ["exr", "dpx", "tif", "jpg", "png", "mov", "mp4", "pdf", "txt", "abc"]
+    names = []
+    for index in range(count):
+        shot = "sq{:03d}_sh{:04d}".format(rng.randint(1, 99), rng.randint(1, 999) * 10)
+        is_sequence = rng.random() < 0.7
+        frames = ".1001-1100#" if is_sequence else ""
+        name = "{}_{}{}.{}".format(shot, rng.choice(stems), frames, rng.choice(extensions))
+        names.append((name, is_sequence))
+    return names
+
+
+def bench_classify(args):
+    from table_rules import TableClassifier
+
+    def legacy_classify(table_config, filename, is_sequence):
+        # The per-sequence loop that used to live in separate_the_ingest_files
+        for key, value in reversed(table_config.items()):
+            regex = re.search(table_config[key]["regex"], filename)
+            filename_extension = (filename.split(".")[-1]).lower()
+            table_name = key
+            if is_sequence:
+                if any(
+                    element in filename.lower()
+                    for element in table_config[table_name]["filter"] or []
+                ) or (
+                    regex and filename_extension == "exr" or filename_extension == "mov"
+                ):
+                    return table_name, bool(regex)
+            elif filename_extension in table_config[table_name]["extensions"]:
+                return table_name, bool(regex)
+        if filename_extension in table_config[table_name]["extensions"]:
+            return table_name, bool(regex)
+        return "UnMatched", False
+
+    def run_legacy(names):
+        return [legacy_classify(SYNTHETIC_TABLES, *name) for name in names]
+
+    def run_classifier(names):
+        classifier = TableClassifier(SYNTHETIC_TABLES)
+        results = []
+        for name in names:
+            table_name, regex = classifier.classify(*name)
+            results.append((table_name, bool(regex)))
+        return results
+
+    names = make_synthetic_names(args.names)
+    legacy_time, legacy_result = timed(run_legacy, names, repeat=args.repeat)
+    classifier_time, classifier_result = timed(run_classifier, names, repeat=args.repeat)
+
+    assert legacy_result == classifier_result, "classifier differs from the table loop"
+    print(f"names              : {len(names)}")
+    print(f"table loop         : {legacy_time:.3f}s")
+    print(f"table classifier   : {classifier_time:.3f}s")
+    print(f"speed up           : {legacy_time / classifier_time:.2f}x")
+
+
+def make_synthetic_published(records, rows, seed=1):
+    """
+    Build published file records and the destination paths validated against them.
+
+    Args:
+        records (int): The number of PublishedFile records.
+        rows (int): The number of destination paths, i.e. checked table rows.
+        seed (int): The random seed.
+
+    Returns:
+        tuple: (published_files, file_paths), the records are dicts with an
+            "sg_filepath" key like read.PublishedFiles returns them.
+    """
+    rng = random.Random(seed)
+    root = "/brahmos/projects/SHOW/shots"
+    elements = ["plate", "ref", "annotation", "mov"]
+    published_files = []
+    for _ in range(records):
+        shot = "sq{:03d}/sq{:03d}_sh{:04d}".format(
+            rng.randint(1, 40), rng.randint(1, 40), rng.randint(1, 250) * 10
+        )
+        element = rng.choice(elements)
+        version = rng.randint(1, 30)
+        filepath = "{}/{}/{}/v{:03d}/{}_v{:03d}.####.exr".format(
+            root, shot, element, version, element, version
+        )
+        # Some records were published without a path
+        published_files.append({"sg_filepath": filepath if rng.random() > 0.01 else None})
+
+    file_paths = []
+    for _ in range(rows):
+        published_file = rng.choice(published_files)
+        if published_file["sg_filepath"] and rng.random() < 0.8:
+            # Most rows republish an element that already has versions
+            file_paths.append(published_file["sg_filepath"].rsplit("/v", 2)[0] + "/")
+            continue
+        shot = "sq{:03d}/sq{:03d}_sh{:04d}".format(
+            rng.randint(1, 40), rng.randint(1, 40), rng.randint(1, 250) * 10
+        )
+        file_paths.append("{}/{}/{}/".format(root, shot, rng.choice(elements)))
+    return published_files, file_paths
+
+
+def bench_versions(args):
+    from version_index import PublishedVersionIndex
+
+    def legacy_versions(published_files, file_paths):
+        # The per-row scan that used to live in ValidateTableData
+        versions = []
+        pattern = r"[\\/]v(\d+)"
+        for file_path in file_paths:
+            filtered_list = [
+                int(match.group(1))
+                for match in (
+                    re.search(pattern, d["sg_filepath"])
+                    for d in published_files
+                    if d["sg_filepath"] and file_path in d["sg_filepath"]
+                )
+                if match
+            ] or [0]
+            versions.append("v" + str(max(filtered_list) + 1).zfill(3))
+        return versions
+
+    def indexed_versions(published_files, file_paths):
+        index = PublishedVersionIndex(d["sg_filepath"] for d in published_files)
+        return [index.next_version(file_path) for file_path in file_paths]
+
+    published_files, file_paths = make_synthetic_published(args.records, args.rows)
+    # The scan is too slow to run for every row, it is timed on a sample and scaled
+    sample = file_paths[: args.legacy_rows]
+    legacy_time, legacy_result = timed(
+        legacy_versions, published_files, sample, repeat=1
+    )
+    legacy_time *= len(file_paths) / len(sample)
+    index_time, index_result = timed(
+        indexed_versions, published_files, file_paths, repeat=args.repeat
+    )
+
+    assert legacy_result == index_result[: len(sample)], "index differs from the scan"
+    print(f"records            : {len(published_files)}")
+    print(f"rows               : {len(file_paths)}")
+    print(f"linear scan        : {legacy_time:.3f}s (from {len(sample)} rows)")
+    print(f"prefix index       : {index_time:.3f}s (build included)")
+    print(f"speed up           : {legacy_time / index_time:.2f}x")
+
+
+class FakeShotGrid:
+    """
+    An in-memory stand-in for the ShotGrid find API.
+
+    Every find() sleeps for the request latency plus the time its JSON
+    response takes over the given bandwidth, and counts the requests,
+    records and bytes returned, so query strategies can be compared offline.
+
+    Attributes:
+        records (list): The PublishedFile records served.
+        latency (float): Seconds per request.
+        bandwidth (float): Response bytes per second, None for no transfer delay.
+        requests (int): The number of find() calls so far.
+        records_sent (int): The number of records returned so far.
+        bytes_sent (int): The JSON size of everything returned so far.
+    """
+
+    def __init__(self, records=None, latency=0.02, bandwidth=20 * 1024 * 1024):
+        """
+        Initialize the FakeShotGrid object.
+
+        Args:
+            records (list): The PublishedFile records to serve.
+            latency (float): Seconds per request.
+            bandwidth (float): Response bytes per second.
+        """
+        self.records = records if records is not None else []
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.requests = 0
+        self.records_sent = 0
+        self.bytes_sent = 0
+        self._last_query = (None, None)
+
+    @staticmethod
+    def _field(record, name):
+        # "project.Project.name" follows the linked entity
+        value = record
+        for part in name.split(".")[::2]:
+            value = value.get(part) if isinstance(value, dict) else None
+        return value
+
+    def _matcher(self, filter_item):
+        if isinstance(filter_item, dict):
+            matchers = [self._matcher(item) for item in filter_item["filters"]]
+            if filter_item["filter_operator"] == "any":
+                # Plain starts_with alternatives collapse into one str.startswith call
+                if all(
+                    isinstance(item, list) and item[1] == "starts_with"
+                    for item in filter_item["filters"]
+                ) and len({item[0] for item in filter_item["filters"]}) == 1:
+                    name = filter_item["filters"][0][0]
+                    prefixes = tuple(item[2] for item in filter_item["filters"])
+                    return lambda record: (self._field(record, name) or "").startswith(prefixes)
+                return lambda record: any(match(record) for match in matchers)
+            return lambda record: all(match(record) for match in matchers)
+
+        name, operator, value = filter_item
+        if operator == "is":
+            return lambda record: self._field(record, name) == value
+        if operator == "starts_with":
+            return lambda record: (self._field(record, name) or "").startswith(value)
+        raise ValueError("unsupported filter operator {}".format(operator))
+
+    def find(self, entity_type, filters, fields, limit=None, page=None):
+        """
+        Return the records matching all filters, like shotgun_api3 find().
+
+        Args:
+            entity_type (str): Only "PublishedFile" is served.
+            filters (list): Conditions and nested {"filter_operator", "filters"} dicts.
+            fields (list): The fields to return besides "type" and "id".
+            limit (int): The page size, None for every record.
+            page (int): The 1 based page number.
+
+        Returns:
+            list: The matching records, reduced to the requested fields.
+        """
+        # Paging the same query does not filter again, a real server keeps a cursor
+        query_key = json.dumps(filters)
+        if self._last_query[0] == query_key:
+            matched = self._last_query[1]
+        else:
+            matchers = [self._matcher(filter_item) for filter_item in filters]
+            matched = [
+                record for record in self.records if all(match(record) for match in matchers)
+            ]
+            self._last_query = (query_key, matched)
+        if limit:
+            start = ((page or 1) - 1) * limit
+            matched = matched[start : start + limit]
+
+        result = [
+            dict(
+                {"type": entity_type, "id": record["id"]},
+                **{field: record.get(field) for field in fields}
+            )
+            for record in matched
+        ]
+        size = len(json.dumps(result))
+        self.requests += 1
+        self.records_sent += len(result)
+        self.bytes_sent += size
+        time.sleep(self.latency + (size / self.bandwidth if self.bandwidth else 0))
+        return result
+
+
+def bench_version_query(args):
+    from version_index import PublishedVersionIndex, PublishedVersionQuery
+
+    published_files, file_paths = make_synthetic_published(args.records, args.rows)
+    project = {"type": "Project", "id": 1, "name": "show"}
+    records = []
+    for record_id, published_file in enumerate(published_files, 1):
+        filepath = published_file["sg_filepath"]
+        records.append(
+            {
+                "id": record_id,
+                "project": project,
+                "code": os.path.basename(filepath or ""),
+                "sg_filepath": filepath,
+                "sg_source_path": "/vendor/delivery/" + os.path.basename(filepath or ""),
+                "description": "Ingested from vendor delivery",
+                "published_file_type": {"type": "PublishedFileType", "id": 3, "name": "Plate"},
+            }
+        )
+    all_fields = ["code", "sg_filepath", "sg_source_path", "description", "published_file_type", "project"]
+
+    def project_download(shotgrid):
+        # Every PublishedFile of the project with every field, like read.PublishedFiles
+        filepaths = []
+        page = 1
+        while True:
+            page_records = shotgrid.find(
+                "PublishedFile",
+                [["project.Project.name", "is", "show"]],
+                all_fields,
+                limit=args.page_size,
+                page=page,
+            )
+            filepaths.extend(record["sg_filepath"] for record in page_records)
+            if len(page_records) < args.page_size:
+                break
+            page += 1
+        index = PublishedVersionIndex(filepaths)
+        return [index.next_version(file_path) for file_path in file_paths]
+
+    def filtered_query(shotgrid):
+        query = PublishedVersionQuery("show", finder=shotgrid.find, batch_size=args.batch_size)
+        index = query.resolve(file_paths)
+        return [index.next_version(file_path) for file_path in file_paths]
+
+    results = []
+    for name, strategy in (("project download", project_download), ("filtered query", filtered_query)):
+        shotgrid = FakeShotGrid(records, latency=args.latency, bandwidth=args.bandwidth * 1024 * 1024)
+        elapsed, versions = timed(strategy, shotgrid, repeat=1)
+        results.append((name, elapsed, shotgrid, versions))
+
+    assert results[0][3] == results[1][3], "filtered query differs from the project download"
+    print(f"records            : {len(records)}")
+    print(f"rows               : {len(file_paths)}")
+    for name, elapsed, shotgrid, _ in results:
+        print(
+            f"{name:<19}: {elapsed:.3f}s, {shotgrid.requests} requests, "
+            f"{shotgrid.records_sent} records, {shotgrid.bytes_sent / 1024 / 1024:.1f} MB"
+        )
+    print(f"speed up           : {results[0][1] / results[1][1]:.2f}x")
+
+
+def import_times(module):
+    """
+    Import a module in a fresh interpreter under "-X importtime".
+
+    Args:
+        module (str): The module to import.
+
+    Returns:
+        tuple: ({imported module: (self microseconds, cumulative microseconds)},
+            the error output if the import failed, else None)
+    """
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import " + module],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+    )
+    times = dict()
+    errors = []
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:"):
+            errors.append(line)
+            continue
+        fields = [field.strip() for field in line[len("import time:"):].split("|")]
+        if fields[0].isdigit():
+            times[fields[2].strip()] = (int(fields[0]), int(fields[1]))
+    return times, "\n".join(errors) if process.returncode else None
+
+
+def bench_startup(args):
+    runs = []
+    for _ in range(args.repeat):
+        times, error = import_times(args.module)
+        if error:
+            # A failed import would record a meaningless time
+            print(error)
+            return
+        runs.append(times)
+
+    # The fastest run has the least noise
+    best = min(runs, key=lambda times: times.get(args.module, (0, float("inf")))[1])
+    total = best.get(args.module, (0, 0))[1]
+    print(f"module             : {args.module}")
+    print(f"import time        : {total / 1000:.1f}ms")
+    print("slowest imports (self time):")
+    for name, (self_time, _) in sorted(best.items(), key=lambda item: -item[1][0])[: args.top]:
+        print(f"    {self_time / 1000:8.1f}ms  {name}")
+
+    if not args.history:
+        return
+
+    try:
+        revision = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            universal_newlines=True,
+        ).stdout.strip()
+    except OSError:
+        revision = ""
+
+    previous = None
+    if os.path.exists(args.history):
+        with open(args.history) as file:
+            entries = [json.loads(line) for line in file if line.strip()]
+        entries = [entry for entry in entries if entry["module"] == args.module]
+        previous = entries[-1] if entries else None
+
+    with open(args.history, "a") as file:
+        entry = {
+            "time": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "revision": revision,
+            "module": args.module,
+            "import_ms": round(total / 1000, 1),
+            "modules": len(best),
+        }
+        file.write(json.dumps(entry) + "\n")
+    if previous:
+        print(
+            f"previous           : {previous['import_ms']:.1f}ms at {previous['revision']}"
+            f" ({entry['import_ms'] - previous['import_ms']:+.1f}ms)"
+        )
+
+
+def bench_deadline_status(args):
+    from deadline_monitor import query_job_details, query_jobs_details
+
+    command = [
+        sys.executable,
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), "fake_deadlinecommand.py"),
+    ]
+    os.environ["FAKE_DEADLINE_STARTUP"] = str(args.startup)
+    job_ids = ["65f0{:08x}".format(index) for index in range(args.jobs)]
+
+    def per_job(job_ids):
+        return {job_id: query_job_details(job_id, command) for job_id in job_ids}
+
+    def batched(job_ids):
+        return query_jobs_details(job_ids, command, batch_size=args.batch_size)
+
+    per_job_time, per_job_result = timed(per_job, job_ids, repeat=1)
+    batched_time, batched_result = timed(batched, job_ids, repeat=1)
+
+    assert set(per_job_result) == set(batched_result), "batched query lost jobs"
+    statuses = Counter(status for _, status in batched_result.values())
+    print(f"jobs               : {len(job_ids)}")
+    print(f"statuses           : {dict(statuses)}")
+    print(f"one call per job   : {per_job_time:.3f}s per poll cycle, {len(job_ids)} processes")
+    calls = -(-len(job_ids) // args.batch_size)
+    print(f"batched calls      : {batched_time:.3f}s per poll cycle, {calls} processes")
+    print(f"speed up           : {per_job_time / batched_time:.2f}x")
+
+
+def make_synthetic_frames(root, kind, frames, frame_size, seed=1):
+    """
+    Write a sequence of frames shaped like EXR scanlines.
+
+    An "uncompressed" frame holds half floats whose high bytes follow a
+    smooth gradient and whose low bytes are noise, about what zlib sees in
+    an uncompressed plate. A "piz" frame is random bytes, like the output
+    of PIZ or DWAA compression.
+
+    Args:
+        root (str): The directory to create the sequence folder in.
+        kind (str): "uncompressed" or "piz".
+        frames (int): The number of frames.
+        frame_size (int): The size of every frame in bytes.
+        seed (int): The random seed.
+
+    Returns:
+        str: The sequence folder path.
+    """
+    rng = random.Random(seed)
+    folder = os.path.join(root, kind)
+    os.makedirs(folder)
+    header = b"\x76\x2f\x31\x01" + b"\x02\x00\x00\x00channels\x00chlist\x00" + bytes(64)
+    for frame in range(1001, 1001 + frames):
+        if kind == "piz":
+            data = rng.randbytes(frame_size)
+        else:
+            data = bytearray(frame_size)
+            data[0::2] = rng.randbytes(len(data[0::2]))
+            data[1::2] = bytes(((index + frame) // 1024) & 0x3F | 0x30 for index in range(len(data[1::2])))
+        with open(os.path.join(folder, f"{kind}.{frame}.exr"), "wb") as file:
+            file.write(header + data)
+    return folder
+
+
+def bench_compression(args):
+    from rsync import choose_compression
+
+    frame_size = int(args.frame_size * 1024 * 1024)
+    bandwidth = args.bandwidth * 1024 * 1024
+
+    temp_dir = tempfile.mkdtemp(prefix="ingest_bench_")
+    try:
+        for kind in ("uncompressed", "piz"):
+            folder = make_synthetic_frames(temp_dir, kind, args.frames, frame_size)
+            frame_paths = sorted(os.path.join(folder, name) for name in os.listdir(folder))
+
+            def compress_all(level):
+                compressed_bytes = 0
+                for frame_path in frame_paths:
+                    with open(frame_path, "rb") as file:
+                        compressed_bytes += len(zlib.compress(file.read(), level))
+                return compressed_bytes
+
+            raw_bytes = sum(os.path.getsize(frame_path) for frame_path in frame_paths)
+            # rsync -z uses zlib level 6, its sender compresses while ssh sends
+            compress_time, compressed_bytes = timed(compress_all, 6, repeat=1)
+            plain_time = raw_bytes / bandwidth
+            zlib_time = max(compress_time, compressed_bytes / bandwidth)
+            # zstd is not in the standard library, zlib level 1 stands in for a cheap codec
+            fast_time, fast_bytes = timed(compress_all, 1, repeat=1)
+            fast_codec_time = max(fast_time, fast_bytes / bandwidth)
+            policy_time, policy = timed(choose_compression, folder, repeat=1)
+
+            print(f"{kind}:")
+            print(f"  frames           : {args.frames} x {args.frame_size}MB")
+            print(f"  zlib ratio       : {compressed_bytes / raw_bytes:.2f}")
+            print(f"  zlib CPU         : {raw_bytes / compress_time / 1024 / 1024:.1f}MB/s")
+            print(f"  without -z       : {raw_bytes / plain_time / 1024 / 1024:.1f}MB/s at {args.bandwidth}MB/s")
+            print(f"  with -z          : {raw_bytes / zlib_time / 1024 / 1024:.1f}MB/s at {args.bandwidth}MB/s")
+            print(f"  with fast codec  : {raw_bytes / fast_codec_time / 1024 / 1024:.1f}MB/s at {args.bandwidth}MB/s")
+            print(f"  policy           : {policy} in {policy_time * 1000:.1f}ms")
+    finally:
+        shutil.rmtree(temp_dir)
+
+
+def resident_memory():
+    """
+    Return the resident memory of this process.
+
+    Returns:
+        int: The resident set size in bytes, 0 where /proc is missing.
+    """
+    try:
+        with open("/proc/self/statm") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return 0
+
+
+def bench_table(args):
+    # Runs without a display
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PySide2 import QtCore, QtGui, QtWidgets
+
+    from ingest_model import IngestItemDelegate, IngestTableModel
+
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    headers = ["Enable", "Sequence", "Shot", "Dept", "Type", "Frame Range", "Version", "Scan ID", "Preview"]
+    departments = ["comp", "roto", "paint", "prep", "matchmove", "lighting"]
+
+    def make_rows(count):
+        rows = []
+        for index in range(count):
+            shot = "sq010_sh{:05d}".format(index * 10)
+            preview = f"/brahmos/projects/SHOW/sq010/{shot}/plate/v###/{shot}_bg01.1001-1100#.exr"
+            rows.append([None, "sq010", shot, departments, "Plate", "1001-1100", "v###", "bg01", preview])
+        return rows
+
+    # The status border pass IngestTableView.paintEvent ran over every cell before the delegate
+    class LegacyTable(QtWidgets.QTableWidget):
+        def paintEvent(self, event):
+            super().paintEvent(event)
+            painter = QtGui.QPainter(self.viewport())
+            for row in range(self.rowCount()):
+                for column in range(self.columnCount()):
+                    item = self.item(row, column)
+                    if item and item.data(QtCore.Qt.UserRole) is not None:
+                        rect = self.visualRect(self.indexFromItem(item))
+                        painter.setPen(QtGui.QPen(item.data(QtCore.Qt.UserRole), 3))
+                        painter.drawRect(rect)
+
+    # The table as IngestTableView.create_table_data built it before the model
+    def legacy_table(rows):
+        table = LegacyTable()
+        table.setColumnCount(len(headers))
+        table.setRowCount(len(rows))
+        for row_index, row in enumerate(rows):
+            for column_index, column_data in enumerate(row):
+                if column_index == 0:
+                    item = QtWidgets.QTableWidgetItem()
+                    item.setCheckState(QtGui.Qt.Checked)
+                    table.setItem(row_index, column_index, item)
+                elif isinstance(column_data, list):
+                    combo_box = QtWidgets.QComboBox()
+                    combo_box.addItems(column_data)
+                    table.setCellWidget(row_index, column_index, combo_box)
+                else:
+                    table.setItem(row_index, column_index, QtWidgets.QTableWidgetItem(str(column_data)))
+        table.setHorizontalHeaderLabels(headers)
+        return table
+
+    def model_table(rows):
+        view = QtWidgets.QTableView()
+        view.verticalHeader().setSectionResizeMode(QtWidgets.QHeaderView.Fixed)
+        model = IngestTableModel(headers, view)
+        view.setModel(model)
+        view.setItemDelegate(IngestItemDelegate(view))
+        model.append_rows(rows)
+        return view
+
+    # The status colour a publish gives every preview cell
+    def legacy_statuses(table):
+        for row_index in range(table.rowCount()):
+            table.item(row_index, len(headers) - 1).setData(QtCore.Qt.UserRole, QtGui.QColor("green"))
+
+    def model_statuses(view):
+        model = view.model()
+        for row_index in range(model.rowCount()):
+            model.set_cell_color(row_index, len(headers) - 1, "green")
+
+    def scroll(view):
+        view.resize(1200, 800)
+        view.show()
+        app.processEvents()
+        scroll_bar = view.verticalScrollBar()
+        step = max(1, scroll_bar.maximum() // args.scroll_steps)
+        steps = 0
+        for value in range(0, scroll_bar.maximum() + 1, step):
+            scroll_bar.setValue(value)
+            view.viewport().repaint()
+            steps += 1
+        return steps
+
+    results = []
+    for name, build, set_statuses, count in (
+        ("QTableWidget + cell widgets", legacy_table, legacy_statuses, args.legacy_rows),
+        ("model + delegates", model_table, model_statuses, args.legacy_rows),
+        ("model + delegates", model_table, model_statuses, args.rows),
+    ):
+        rows = make_rows(count)
+        memory_before = resident_memory()
+        build_time, view = timed(build, rows, repeat=1)
+        memory = resident_memory() - memory_before
+        set_statuses(view)
+        scroll_time, steps = timed(scroll, view, repeat=1)
+        results.append((name, count, build_time, memory, scroll_time / max(steps, 1)))
+        view.close()
+        view.deleteLater()
+        app.processEvents()
+
+    for name, count, build_time, memory, step_time in results:
+        print(f"{name} ({count} rows):")
+        print(f"  build            : {build_time:.3f}s")
+        print(f"  memory           : {memory / 1024 / 1024:.1f}MB")
+        print(f"  scroll repaint   : {step_time * 1000:.2f}ms per step")
+    print(f"build speed up     : {results[0][2] / results[1][2]:.2f}x at {args.legacy_rows} rows")
+    print(f"repaint speed up   : {results[0][4] / results[1][4]:.2f}x at {args.legacy_rows} rows")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Ingest tool benchmarks")
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    scan_parser = subparsers.add_parser("scan", help="directory scanning")
+    scan_parser.add_argument("--shots", type=int, default=200)
+    scan_parser.add_argument("--frames", type=int, default=200)
+    scan_parser.add_argument("--repeat", type=int, default=3)
+    scan_parser.set_defaults(func=bench_scan)
+
+    classify_parser = subparsers.add_parser("classify", help="sequence to table matching")
+    classify_parser.add_argument("--names", type=int, default=100000)
+    classify_parser.add_argument("--repeat", type=int, default=3)
+    classify_parser.set_defaults(func=bench_classify)
+
+    versions_parser = subparsers.add_parser("versions", help="next version lookup")
+    versions_parser.add_argument("--records", type=int, default=200000)
+    versions_parser.add_argument("--rows", type=int, default=1000)
+    versions_parser.add_argument("--legacy-rows", type=int, default=20)
+    versions_parser.add_argument("--repeat", type=int, default=3)
+    versions_parser.set_defaults(func=bench_versions)
+
+    query_parser = subparsers.add_parser("version-query", help="published file queries")
+    query_parser.add_argument("--records", type=int, default=200000)
+    query_parser.add_argument("--rows", type=int, default=50)
+    query_parser.add_argument("--batch-size", type=int, default=50)
+    query_parser.add_argument("--page-size", type=int, default=500, help="records per request of the project download")
+    query_parser.add_argument("--latency", type=float, default=0.02)
+    query_parser.add_argument("--bandwidth", type=float, default=20, help="MB per second")
+    query_parser.set_defaults(func=bench_version_query)
+
+    startup_parser = subparsers.add_parser("startup", help="module import time")
+    startup_parser.add_argument("--module", default="main")
+    startup_parser.add_argument("--repeat", type=int, default=5)
+    startup_parser.add_argument("--top", type=int, default=15)
+    startup_parser.add_argument("--history", help="JSON lines file the result is appended to")
+    startup_parser.set_defaults(func=bench_startup)
+
+    deadline_parser = subparsers.add_parser("deadline-status", help="Deadline job status polling")
+    deadline_parser.add_argument("--jobs", type=int, default=500)
+    deadline_parser.add_argument("--batch-size", type=int, default=100)
+    deadline_parser.add_argument("--startup", type=float, default=0, help="fake deadlinecommand start up seconds")
+    deadline_parser.set_defaults(func=bench_deadline_status)
+
+    compression_parser = subparsers.add_parser("compression", help="transfer compression policy")
+    compression_parser.add_argument("--frames", type=int, default=20)
+    compression_parser.add_argument("--frame-size", type=float, default=8, help="MB per frame")
+    compression_parser.add_argument("--bandwidth", type=float, default=100, help="MB per second")
+    compression_parser.set_defaults(func=bench_compression)
+
+    table_parser = subparsers.add_parser("table", help="ingest table build and scrolling")
+    table_parser.add_argument("--rows", type=int, default=50000)
+    table_parser.add_argument("--legacy-rows", type=int, default=2000)
+    table_parser.add_argument("--scroll-steps", type=int, default=200)
+    table_parser.set_defaults(func=bench_table)
+
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    args.func(args)
@@ -0,0 +1,202 @@
+"""
+copy_engine.py:
+
+This module defines the CopyScheduler class, which copies many published
+ sequences at once on a bounded worker pool with the file_utils.file_op
+   copy helpers.
+
+Classes:
+    CopyScheduler:
+        Schedules sequence copies across a thread pool with a concurrency
+        limit per destination file server and reports progress.
+
+Functions:
+    copy_to_directory(source, destination_directory):
+        Copies a sequence with copy_file_seq, or a single file with copy_file.
+
+    destination_server(path):
+        Returns the file server name of an absolute path, e.g. "brahmos"
+        for "/brahmos/projects/...".
+
+Usage:
+    scheduler = CopyScheduler(max_workers=16, server_limits={"brahmos": 8})
+    future = scheduler.submit(seq, "/brahmos/projects/SHOW/shots/sq010/sh0010/plate/v001")
+    scheduler.wait(on_progress=print)
+    future.result()  # raises the error of copy_file_seq
+"""
+
+
+import os
+import threading
+
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+
+DEFAULT_MAX_WORKERS = 16
+DEFAULT_SERVER_LIMIT = 8
+
+
+def destination_server(path):
+    """
+    Return the file server an absolute path lives on.
+
+    Args:
+        path (str): An absolute path like "/brahmos/projects/...".
+
+    Returns:
+        str: The first path component, e.g. "brahmos".
+    """
+    parts = os.path.abspath(path).split(os.sep)
+    return parts[1] if len(parts) > 1 else ""
+
+
+def copy_to_directory(source, destination_directory):
+    """
+    Copy a sequence or a single file into a directory with the file_op helpers.
+
+    Args:
+        source: A fileseq.FileSequence, or the path of a single file.
+        destination_directory (str): The directory to copy into.
+    """
+    from file_utils.file_op import copy_file, copy_file_seq
+
+    if isinstance(source, str):
+        copy_file(source, destination_directory)
+    else:
+        copy_file_seq(source, destination_directory)
+
+
+class CopyScheduler:
+    """
+    Copies many sequences on one bounded worker pool.
+
+    Every sequence is its own task, copied by the file_op helpers the
+    publish always used. A semaphore per destination file server caps how
+    many copies hit the same server at once.
+
+    Attributes:
+        max_workers (int): The size of the worker pool.
+        server_limits (dict): File server name to its maximum concurrent copies.
+        default_server_limit (int): The limit of servers missing from server_limits.
+    """
+
+    def __init__(self, max_workers=None, server_limits=None, default_server_limit=None):
+        """
+        Initialize the CopyScheduler object.
+
+        Args:
+            max_workers (int): The size of the worker pool.
+            server_limits (dict): File server name to its maximum concurrent copies.
+            default_server_limit (int): The limit of servers missing from server_limits.
+        """
+        self.max_workers = max_workers or DEFAULT_MAX_WORKERS
+        self.server_limits = server_limits or {}
+        self.default_server_limit = default_server_limit or DEFAULT_SERVER_LIMIT
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        self._semaphores = dict()
+        self._lock = threading.Lock()
+        self._futures = []
+        self._cancelled = threading.Event()
+        self.bytes_total = 0
+        self.bytes_done = 0
+        self.frames_total = 0
+        self.frames_done = 0
+
+    def _server_semaphore(self, path):
+        server = destination_server(path)
+        with self._lock:
+            if server not in self._semaphores:
+                limit = self.server_limits.get(server, self.default_server_limit)
+                self._semaphores[server] = threading.BoundedSemaphore(limit)
+            return self._semaphores[server]
+
+    def submit(self, source, destination_directory):
+        """
+        Queue the copy of a sequence or a single file into a directory.
+
+        Args:
+            source: A fileseq.FileSequence, or the path of a single file.
+            destination_directory (str): The directory to copy the frames into.
+
+        Returns:
+            concurrent.futures.Future: Resolves to the number of bytes copied,
+                or raises the error of the copy.
+        """
+        frames = [source] if isinstance(source, str) else [str(frame) for frame in source]
+        size = 0
+        for frame in frames:
+            try:
+                size += os.path.getsize(frame)
+            except OSError:
+                pass
+
+        with self._lock:
+            self.bytes_total += size
+            self.frames_total += len(frames)
+            future = self._executor.submit(
+                self._copy_sequence, source, destination_directory, size, len(frames)
+            )
+            self._futures.append(future)
+        return future
+
+    def _copy_sequence(self, source, destination_directory, size, frame_count):
+        if self._cancelled.is_set():
+            raise InterruptedError("Copy cancelled {}".format(source))
+
+        try:
+            with self._server_semaphore(destination_directory):
+                copy_to_directory(source, destination_directory)
+            with self._lock:
+                self.bytes_done += size
+            return size
+        finally:
+            with self._lock:
+                self.frames_done += frame_count
+
+    def progress(self):
+        """
+        Return a snapshot of the copy progress.
+
+        Returns:
+            dict: "bytes_done", "bytes_total", "frames_done" and "frames_total".
+        """
+        with self._lock:
+            return {
+                "bytes_done": self.bytes_done,
+                "bytes_total": self.bytes_total,
+                "frames_done": self.frames_done,
+                "frames_total": self.frames_total,
+            }
+
+    def wait(self, on_progress=None, interval=0.1):
+        """
+        Block until every queued sequence is copied, reporting progress while waiting.
+
+        Args:
+            on_progress (callable): Called with progress() every interval seconds
+                on the waiting thread, e.g. to update a progress dialog.
+            interval (float): Seconds between progress reports.
+        """
+        while True:
+            with self._lock:
+                pending = [future for future in self._futures if not future.done()]
+            if not pending:
+                break
+            if on_progress:
+                on_progress(self.progress())
+            wait(pending, timeout=interval, return_when=FIRST_COMPLETED)
+
+        if on_progress:
+            on_progress(self.progress())
+
+    def cancel(self):
+        """
+        Skip every sequence that has not started copying yet.
+        """
+        self._cancelled.set()
+
+    def shutdown(self):
+        """
+        Release the worker pool once all copies are done.
+        """
+        self._executor.shutdown(wait=True)
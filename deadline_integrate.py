@@ -6,9 +6,11 @@ run cmd:-
 
 #!/usr/local/bin/python3.9
 import argparse
+import json
 import subprocess
 import os
 import socket
+import tempfile
 import logging
 import re
 import yaml
@@ -17,6 +19,8 @@ import grp
 
 from pathlib import Path
 
+from rsync import DEFAULT_COMPRESSION, choose_compression, write_source_manifest
+
 
 # Parse command-line arguments
 def parse_args():
@@ -28,6 +32,19 @@ def parse_args():
 
     return args
 config="/tools/common/cfg/deadline_transfer.yaml"
+# Define the path to the Deadline Command executable
+DEADLINE_COMMAND = "/opt/Thinkbox/Deadline10/bin/deadlinecommand"
+# Batch transfers: rsync pairs per Deadline task and tasks running at once,
+# overridden per destination by "chunk_size" and "concurrent_tasks" in the config
+DEFAULT_TRANSFER_CHUNK_SIZE = 10
+DEFAULT_CONCURRENT_TASKS = 4
+# Parallel rsync streams per transfer, overridden per destination by "streams"
+DEFAULT_TRANSFER_STREAMS = 1
+# Batch manifests are read by the transfer blades, so "manifest_dir" in the config must be
+# a shared folder. Manifests older than "manifest_max_age_days" are removed from it.
+DEFAULT_MANIFEST_MAX_AGE_DAYS = 7
+# Compression is set per destination by "compression": none, zlib, zstd or auto,
+# which sends already compressed sequences without -z and the rest with "compress_choice"
 
 # Initialize the logger
 def get_logger():
@@ -57,8 +74,8 @@ def extract_path(path):
 
 
 # # Write job information to a file
-def write_job_info_file(details):
-    job_info_file = os.getcwd() + "/job_info.job"
+def write_job_info_file(details, directory=None):
+    job_info_file = os.path.join(directory or os.getcwd(), "job_info.job")
     with open(job_info_file, "w+") as file:
          file.write(details)
     return job_info_file
@@ -75,61 +92,70 @@ def extract_job_id(stdout_lines):
      return job_id
 
 # Extract the progress percentage and job status from job details
-# def extract_progress_and_job_status(lines):
-#     progress_percent = None
-#     job_status = "Unknown"  # Default status if not found in the details
+def extract_progress_and_job_status(lines):
+    progress_percent = None
+    job_status = "Unknown"  # Default status if not found in the details
 
-#     for line in lines:
-#         if "Status:" in line:
-#             job_status = line.split("Status:")[1].strip().lower()
-#         if "Progress:" in line:
-#             progress_match = re.search(r"Progress:(\d+\s*%)\s+\(\d+/\d+\)", line)
-#             if progress_match:
-#                 progress_percent = int(progress_match.group(1).replace("%", "").strip())
+    for line in lines:
+        if "Status:" in line:
+            job_status = line.split("Status:")[1].strip().lower()
+        if "Progress:" in line:
+            progress_match = re.search(r"Progress:(\d+\s*%)\s+\(\d+/\d+\)", line)
+            if progress_match:
+                progress_percent = int(progress_match.group(1).replace("%", "").strip())
 
-#     return progress_percent, job_status
+    return progress_percent, job_status
 
 
 # Write plugin information to a file
-# def write_plugin_info_file(details):
-#     plugin_info_file = os.getcwd() + "/plugin_info.job"
-#     with open(plugin_info_file, "w+") as file:
-#         file.write(details)
-#     return plugin_info_file
+def write_plugin_info_file(details, directory=None):
+    plugin_info_file = os.path.join(directory or os.getcwd(), "plugin_info.job")
+    with open(plugin_info_file, "w+") as file:
+        file.write(details)
+    return plugin_info_file
+
+# Directory the per-submission info files are created in, tmpfs keeps them off the disk
+def get_info_file_dir():
+    if os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK):
+        return "/dev/shm"
+    return None  # the system temporary directory
 
-# def show_progress_bar(percentage, length=50):
-#     block = int(round(length * percentage / 100))
-#     progress = "█" * block + "-" * (length - block)
-#     print(f"[{progress}] {percentage:.1f}%", end="\r")
+def show_progress_bar(percentage, length=50):
+    block = int(round(length * percentage / 100))
+    progress = "█" * block + "-" * (length - block)
+    print(f"[{progress}] {percentage:.1f}%", end="\r")
 
-# Submit the job to Deadline
+# Submit the job to Deadline, the job is followed by a DeadlineJobMonitor
 
 def submit_to_deadline(file_source,destination_server):
     LOGGER = get_logger()
-    # Define the path to the Deadline Command executable
-    deadline_cmd = "/opt/Thinkbox/Deadline10/bin/deadlinecommand"
+    deadline_cmd = DEADLINE_COMMAND
     # print ("****submit_to_deadline file_source",file_source)
     # print ("****submit_to_deadline destination_server",destination_server)
-    # Write job and plugin information to temporary files
-    job_file = write_job_info_file(str(destination_server).strip())
-    plugin_file = write_plugin_info_file(str(file_source).strip())
     print ("****submit_to_deadline file_source",file_source)
     print ("****submit_to_deadline destination_server",destination_server)
-    # Define the path to the script to be executed by Deadline
-    py_file = os.getcwd() + "/rsync"
+    # Define the path to the script to be executed by Deadline, next to this file
+    # so the submission does not depend on the working directory
+    py_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), "rsync")
+
+    # Write job and plugin information to files of this submission only, so
+    # submissions from several threads never overwrite each other. They are
+    # removed as soon as deadlinecommand has read them.
+    with tempfile.TemporaryDirectory(prefix="deadline_submit_", dir=get_info_file_dir()) as info_dir:
+        job_file = write_job_info_file(str(destination_server).strip(), info_dir)
+        plugin_file = write_plugin_info_file(str(file_source).strip(), info_dir)
 
-    # Create a list containing the command to execute the Deadline job
-    command = [deadline_cmd, job_file, plugin_file, py_file]
+        # Create a list containing the command to execute the Deadline job
+        command = [deadline_cmd, job_file, plugin_file, py_file]
 
-    # Execute the command to submit the job to Deadline
-    process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        # Execute the command to submit the job to Deadline
+        process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        stdout, stderr = process.communicate()
 
     # Extract the 'Allowlist' information from job details
     allowlist_match = re.search(r"Allowlist=(.*)", destination_server)
     allowlist = allowlist_match.group(1).strip() if allowlist_match else "N/A"
 
-    # Capture the standard output (stdout) and standard error (stderr) of the process
-    stdout, stderr = process.communicate()
     # Log job submission status
     if stdout:
         LOGGER.info(
@@ -145,72 +171,32 @@ def submit_to_deadline(file_source,destination_server):
 
     stdout_lines = stdout.decode("utf-8").split("\n")
     job_id = extract_job_id(stdout_lines)
+    if job_id is None:
+        LOGGER.error(f"ERROR - Source path: {file_source}, no JobID in the submission output")
 
-    
+    # The caller follows the job, e.g. with DeadlineJobMonitor.watch(job_id)
+    return job_id
 
-    # Continuously query the job's progress until it's complete
-    while True:
-        try:
-            # Define the command to get job details using the JobID
-            cmd = [deadline_cmd, "-GetJobDetails", job_id]
-
-            # Execute the command to get job details
-            process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-            stdout, stderr = process.communicate()
-            lines = stdout.split("\n")
-            progress_percent, job_status = extract_progress_and_job_status(lines)
-      
-            # Display the progress using a progress bar
-            if progress_percent is not None:
-                show_progress_bar(progress_percent, length=50)
-
-            # If the job status is "Failed," break the loop
-            if job_status == "failed":
-                print("\n")
-                print("Failed to transfer to the destination path.")
-                print("JOBID => ",job_id)
-                print("Please contact pipeline team to check this issue")
-                break
-            elif job_status=='suspended':
-                print("\n")
-                print("job is suspended")
-                print("JOBID => ", job_id)
-                print("Please contact pipeline team to check this issue")
-                break
-            
-
-            # If progress reaches 100%, the job is successfully completed
-            if progress_percent is not None and progress_percent >= 100:
-                print("\n")
-                print("Successfully transferred to the destination path.")
-                break
-
-            # Wait for a second before checking progress again
-            time.sleep(1)
-        except Exception as e:
-            # Handle and log errors that occur during progress checking
-            LOGGER.error(f"Error while checking job progress: {str(e)}")
-
-
-# def get_location_long_name(shortname):
-#     loc_detail = {"chn": "chennai", "pne": "pune", "hyd": "hyderabad"}
-#     return loc_detail.get(shortname, None)
-
-
-# def get_source_config():
-#     LOGGER = get_logger()
-#     machine_name = socket.gethostname()
-#     source_location = get_location_long_name(machine_name[:3])
-#     if source_location in config:
-#         source_config = config[source_location]
-#         return source_location, source_config
-#     else:
-#         LOGGER.error(
-#             f"Unable to find the source location of the machine {machine_name}"
-#         )
-#         raise ValueError(
-#             f"Unable to find the source location of the machine {machine_name}"
-#         )
+
+def get_location_long_name(shortname):
+    loc_detail = {"chn": "chennai", "pne": "pune", "hyd": "hyderabad"}
+    return loc_detail.get(shortname, None)
+
+
+def get_source_config(transfer_config):
+    LOGGER = get_logger()
+    machine_name = socket.gethostname()
+    source_location = get_location_long_name(machine_name[:3])
+    if source_location in transfer_config:
+        source_config = transfer_config[source_location]
+        return source_location, source_config
+    else:
+        LOGGER.error(
+            f"Unable to find the source location of the machine {machine_name}"
+        )
+        raise ValueError(
+            f"Unable to find the source location of the machine {machine_name}"
+        )
 
 
 # def validate_user_access(file_source,server):
@@ -256,94 +242,93 @@ def submit_to_deadline(file_source,destination_server):
 #         # raise ValueError("Invalid source path", source_path)
 
 
-def get_source_and_destination(file_source,server):
-    destination_location = server.lower()
+# Resolve the blades and the rsync source/destination of a transfer
+def resolve_transfer(file_source, destination_location, transfer_config, server_name=None):
+    LOGGER = get_logger()
+    destination_location = destination_location.lower()
     source_path = file_source
-    source_location=file_source
-    source_config = "/tools/common/cfg/deadline_transfer.yaml"
+    source_location, source_config = get_source_config(transfer_config)
     # validate_source_path(source_config,file_source)
-#     # validate_user_access(file_source,server)
+    # validate_user_access(file_source,server)
+
+    if destination_location in transfer_config:
+        destination_config = transfer_config[destination_location]
+        allowlist = ",".join(destination_config.get("blades", []))
+        if not server_name:
+            # Get the first key of the server dictionary as the default server name
+            server_name = list(destination_config["server"].keys())[0]
+
+        # Check if the specified server_name exists in the server dictionary
+        if server_name not in destination_config["server"]:
+            LOGGER.error(
+                f"ERROR - Invalid server name. Available options for '{destination_location}' are {', '.join(destination_config['server'].keys())}, but given server name is {server_name}"
+            )
+            raise ValueError(
+                f"Invalid server name. Available options are {', '.join(destination_config['server'].keys())}"
+            )
+
+        server_prefix = destination_config["server"][server_name]
+
+        # Check if the source path starts with any of the server_prefix
+        matched_key = next(
+            (key for key in server_prefix if source_path.startswith(key)), None
+        )
 
+        if matched_key:
+            destination_path = source_path  # Use the same path as source
+        else:
+            destination_path = server_prefix[0]
+
+            # Extract the next-level directory from source and destination paths
+            source_server, source_mount = extract_path(source_path)
+            destination_server, destination_mount = extract_path(destination_path)
+            if source_server == destination_server:
+                LOGGER.error(
+                    f"Source-{source_server} and destination-{destination_server} servers are same."
+                )
+                raise ValueError(
+                    f"Source-{source_server} and destination-{destination_server} servers are same."
+                )
+
+            if source_mount != destination_mount:
+                LOGGER.error(
+                    f"Source-{source_mount} and destination-{destination_mount} mounts are different"
+                )
+                raise ValueError(
+                    f"Source-{source_mount} and destination-{destination_mount} mounts are different"
+                )
+
+            source_server_prefix = source_config["server"].get(source_server, None)[0]
+            destination_path = (
+                destination_path + source_path.split(source_server_prefix)[1]
+            )
+
+        if source_location != destination_location:
+            source_path = f"{source_config['blades'][0]}:{source_path}"
+
+        return allowlist, source_path, destination_path
+
+    else:
+        LOGGER.error(
+            f"ERROR - Invalid destination. Available options are {', '.join(transfer_config.keys())}, but given destination is {destination_location}"
+        )
+        raise ValueError(
+            f"Invalid destination. Available options are {', '.join(transfer_config.keys())}"
+        )
 
-#     if destination_location in config:
-#         LOGGER = get_logger()
-#         destination_config = config[destination_location]
-#         allowlist = ",".join(destination_config.get("blades", []))
-#         if destination_location:
-#             server_name =destination_location
-#         else:
-#             # Get the first key of the server dictionary as the default server name
-#             server_name = list(destination_config["server"].keys())[0]
-
-#         # Check if the specified server_name exists in the server dictionary
-#         if server_name not in destination_config["server"]:
-#             LOGGER.error(
-#                 f"ERROR - Invalid server name. Available options for '{destination_location}' are {', '.join(destination_config['server'].keys())}, but given server name is {server_name}"
-#             )
-#             raise ValueError(
-#                 f"Invalid server name. Available options are {', '.join(destination_config['server'].keys())}"
-#             )
-
-#         server_prefix = destination_config["server"][server_name]
-
-#         # Check if the source path starts with any of the server_prefix
-#         matched_key = next(
-#             (key for key in server_prefix if source_path.startswith(key)), None
-#         )
-
-#         if matched_key:
-#             destination_path = source_path  # Use the same path as source
-#         else:
-#             destination_path = server_prefix[0]
-
-#             # Extract the next-level directory from source and destination paths
-#             source_server, source_mount = extract_path(source_path)
-#             destination_server, destination_mount = extract_path(destination_path)
-#             if source_server == destination_server:
-#                 LOGGER.error(
-#                     f"Source-{source_server} and destination-{destination_server} servers are same."
-#                 )
-#                 raise ValueError(
-#                     f"Source-{source_server} and destination-{destination_server} servers are same."
-#                 )
-
-#             if source_mount != destination_mount:
-#                 LOGGER.error(
-#                     f"Source-{source_mount} and destination-{destination_mount} mounts are different"
-#                 )
-#                 raise ValueError(
-#                     f"Source-{source_mount} and destination-{destination_mount} mounts are different"
-#                 )
-
-#             source_server_prefix = source_config["server"].get(source_server, None)[0]
-#             print("-----source_server_prefix",source_server_prefix)
-#             destination_path = (
-#                 destination_path + source_path.split(source_server_prefix)[1]
-#             )
-
-#         if source_location != destination_location:
-#             source_path = f"{source_config['blades'][0]}:{source_path}"
-#         rsync_arguments = f"{source_path},{destination_path}"
-
-#         return allowlist, rsync_arguments
-
-#     else:
-#         LOGGER.error(
-#             f"ERROR - Invalid destination. Available options are {', '.join(config.keys())}, but given destination is {destination_location}"
-#         )
-#         raise ValueError(
-#             f"Invalid destination. Available options are {', '.join(config.keys())}"
-#         )
 
+def get_source_and_destination(file_source, destination_location, transfer_config, server_name=None):
+    allowlist, source_path, destination_path = resolve_transfer(
+        file_source, destination_location, transfer_config, server_name
+    )
+    rsync_arguments = f"{source_path},{destination_path}"
+    return allowlist, rsync_arguments
 
 
 # get information and transfer files
-def get_info_txt():
+def get_info_txt(rsync_arguments, allowlist, frames="1", concurrent_tasks=1):
     machinename = socket.gethostname()
-    allowlist, rsync_arguments = get_source_and_destination(file_source,server)
-    print ("machinename=========",machinename)
-    print ("allowlist=========",allowlist)
-    print ("rsync_arguments=========",rsync_arguments)
+
     src = f"""
     Arguments= {rsync_arguments}
     SingleFramesOnly=False
@@ -359,27 +344,176 @@ def get_info_txt():
     Group=pip
     Priority=50
     TaskTimeoutMinutes=0
-    ConcurrentTasks=1
-    Frames=1
+    ConcurrentTasks={concurrent_tasks}
+    Frames={frames}
+    ChunkSize=1
     UserName={os.getlogin()}
     MachineName={machinename}
     """
-    print ("dest=========",dest)
-    print ("src=========",src)
+
     return src, dest
 
 
+# The shared folder of the batch manifests, there is no local fallback the blades could read
+def get_manifest_dir(transfer_config):
+    manifest_dir = transfer_config.get("manifest_dir")
+    if not manifest_dir:
+        get_logger().error(f"No manifest_dir in {config}, batch transfers need a shared folder")
+        raise ValueError(f"No manifest_dir in {config}, batch transfers need a shared folder")
+    return manifest_dir
+
+
+# Whether the transfers of a server can go out as one batch job, which needs the shared
+# "manifest_dir"; without it every published file is submitted as its own job, as before
+def batch_transfer_available(server):
+    if server != 'brahmos':
+        return True
+    try:
+        transfer_config = read_config(config)
+    except OSError:
+        # Each job reports the unreadable config of its own row
+        return False
+    if transfer_config.get("manifest_dir"):
+        return True
+    get_logger().warning(f"No manifest_dir in {config}, submitting one transfer job per published file")
+    return False
+
+
+# Remove the manifests of old batch jobs, their tasks finished long ago
+def remove_old_manifests(manifest_dir, max_age_days):
+    cutoff = time.time() - max_age_days * 24 * 60 * 60
+    for manifest_file in Path(manifest_dir).glob("transfer_*.json"):
+        try:
+            if manifest_file.stat().st_mtime < cutoff:
+                manifest_file.unlink()
+        except OSError as e:
+            # Another submission may have removed it already
+            get_logger().error(f"Transfer manifest not removed - {e} for file: {manifest_file}")
+
+
+# Write the rsync pairs of a batch job, one list of pairs per task
+def write_transfer_manifest(chunks, manifest_dir, max_age_days=DEFAULT_MANIFEST_MAX_AGE_DAYS):
+    os.makedirs(manifest_dir, exist_ok=True)
+    remove_old_manifests(manifest_dir, max_age_days)
+    with tempfile.NamedTemporaryFile(
+        "w",
+        dir=manifest_dir,
+        prefix="transfer_{}_".format(socket.gethostname()),
+        suffix=".json",
+        delete=False,
+    ) as file:
+        json.dump({"chunks": chunks}, file)
+    # The transfer blades read it, whatever user the Deadline worker runs as
+    os.chmod(file.name, 0o644)
+    return file.name
+
+
+# Extra rsync.py arguments of a destination site, e.g. its number of parallel streams
+def get_transfer_options(destination_config, compression=None):
+    streams = destination_config.get("streams", DEFAULT_TRANSFER_STREAMS)
+    options = f" --streams {streams}" if streams > 1 else ""
+    if destination_config.get("delta"):
+        options += " --delta"
+    if compression:
+        options += f" --compression {compression}"
+    return options
+
+
+# Compression of a transfer from the site's "compression" policy, "auto" samples the
+# source here where it is local, with "compress_choice" as the codec of compressible frames
+def get_compression(file_source, destination_config):
+    compression = destination_config.get("compression", DEFAULT_COMPRESSION)
+    if compression == "auto":
+        return choose_compression(file_source, destination_config.get("compress_choice", "zstd"))
+    return compression
+
+
+# Refresh the content manifest inside a source folder, the transfer job diffs it against the destination
+def prepare_delta_manifest(file_source, destination_config):
+    if not destination_config.get("delta") or not os.path.isdir(file_source):
+        return
+    try:
+        write_source_manifest(file_source)
+    except OSError as e:
+        # Without a manifest the job sends the whole folder
+        get_logger().error(f"Transfer manifest not written - {e} for folder: {file_source}")
+
+
+# The published version folder is transferred, the sg_filepath is a frame pattern
+def publish_transfer_source(publish_data):
+    return os.path.dirname(publish_data['sg_filepath']) + os.sep
+
+
 def deadline_ingest(publish_data,server):
-    file_source = publish_data['sg_filepath']
-    # dst=server
-    # args = parse_args()
-    print("=====file_source=========",file_source)
-    print("============ server",server)
-    file_source, server = get_info_txt(file_source,server)
-    # shots.create(args.project, args.sequence, args.shot, args.dept, args.config)
+    file_source = publish_transfer_source(publish_data)
     if server =='brahmos':
         destination_server="chennai"
-        submit_to_deadline(file_source,destination_server)
+        transfer_config = read_config(config)
+        allowlist, rsync_arguments = get_source_and_destination(
+            file_source, destination_server, transfer_config
+        )
+        destination_config = transfer_config.get(destination_server, {})
+        prepare_delta_manifest(file_source, destination_config)
+        rsync_arguments += get_transfer_options(
+            destination_config, get_compression(file_source, destination_config)
+        )
+        src, dest = get_info_txt(rsync_arguments, allowlist)
+        return submit_to_deadline(src, dest)
+    return None
+
+
+# Submit the transfers of many published files as one job, one task per chunk of pairs.
+# Returns the job ID and the errors of the publish_data_list indexes that were left out.
+def deadline_ingest_batch(publish_data_list, server, chunk_size=None):
+    if server != 'brahmos' or not publish_data_list:
+        return None, {}
+
+    LOGGER = get_logger()
+    destination_server = "chennai"
+    transfer_config = read_config(config)
+    destination_config = transfer_config.get(destination_server, {})
+    chunk_size = chunk_size or destination_config.get("chunk_size", DEFAULT_TRANSFER_CHUNK_SIZE)
+    concurrent_tasks = destination_config.get("concurrent_tasks", DEFAULT_CONCURRENT_TASKS)
+    manifest_dir = get_manifest_dir(transfer_config)
+
+    allowlist = None
+    pairs = []
+    errors = {}
+    for index, publish_data in enumerate(publish_data_list):
+        file_source = publish_transfer_source(publish_data)
+        try:
+            allowlist, source_path, destination_path = resolve_transfer(
+                file_source, destination_server, transfer_config
+            )
+        except ValueError as e:
+            # One bad path leaves its row out, the rest are still transferred
+            LOGGER.error(f"ERROR - Source path: {file_source}, not transferred - {e}")
+            errors[index] = e
+            continue
+        prepare_delta_manifest(file_source, destination_config)
+        pairs.append([source_path, destination_path, get_compression(file_source, destination_config)])
+
+    if not pairs:
+        return None, errors
+
+    chunks = [pairs[start : start + chunk_size] for start in range(0, len(pairs), chunk_size)]
+    manifest_file = write_transfer_manifest(
+        chunks,
+        manifest_dir,
+        transfer_config.get("manifest_max_age_days", DEFAULT_MANIFEST_MAX_AGE_DAYS),
+    )
+    # The Python plugin replaces <STARTFRAME> with the task number
+    src, dest = get_info_txt(
+        f"--manifest {manifest_file} <STARTFRAME>" + get_transfer_options(destination_config),
+        allowlist,
+        frames=f"0-{len(chunks) - 1}",
+        concurrent_tasks=concurrent_tasks,
+    )
+    job_id = submit_to_deadline(src, dest)
+    if job_id is None:
+        # No job will read it
+        os.remove(manifest_file)
+    return job_id, errors
 
 if __name__ == "__main__":
     os.chdir(
@@ -387,10 +521,37 @@ if __name__ == "__main__":
     )  # Change directory from symlink directory to project directory
     LOGGER = get_logger()
     args = parse_args()
-    config = read_config("/tools/common/cfg/deadline_transfer.yaml")
-    src, dest = get_info_txt()
+    transfer_config = read_config(config)
+    allowlist, rsync_arguments = get_source_and_destination(
+        args.source, args.destination, transfer_config, args.server
+    )
+    destination_config = transfer_config.get(args.destination.lower(), {})
+    prepare_delta_manifest(args.source, destination_config)
+    rsync_arguments += get_transfer_options(
+        destination_config, get_compression(args.source, destination_config)
+    )
+    src, dest = get_info_txt(rsync_arguments, allowlist)
     print ("****get_info_txt src",src)
     print ("****get_info_txt dest",dest)
-    submit_to_deadline(src, dest)
+    job_id = submit_to_deadline(src, dest)
+
+    from deadline_monitor import DeadlineJobMonitor
+
+    def report(job_id, job_status, progress_percent):
+        # Display the progress using a progress bar
+        if progress_percent is not None:
+            show_progress_bar(progress_percent, length=50)
+        if job_status == "completed":
+            print("\n")
+            print("Successfully transferred to the destination path.")
+        elif job_status in ("failed", "suspended", "timeout"):
+            print("\n")
+            print(f"Transfer {job_status}.")
+            print("JOBID => ", job_id)
+            print("Please contact pipeline team to check this issue")
+
+    monitor = DeadlineJobMonitor(on_update=report)
+    monitor.watch(job_id)
+    monitor.wait()
     
 
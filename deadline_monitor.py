@@ -0,0 +1,280 @@
+"""
+deadline_monitor.py:
+
+This module defines the DeadlineJobMonitor class, which follows the
+ progress of many Deadline transfer jobs from one background thread,
+   so submitting a job never waits for it to finish.
+
+Classes:
+    DeadlineJobMonitor:
+        Polls every watched job in one shared cycle with exponential
+        backoff and a hard timeout per job, and reports progress and the
+        final status through callbacks.
+
+Functions:
+    query_job_details(job_id):
+        Returns (progress_percent, job_status) of one job from deadlinecommand.
+
+    query_jobs_details(job_ids):
+        Returns the (progress_percent, job_status) of many jobs, asked for
+        in one deadlinecommand call per batch.
+
+Usage:
+    monitor = DeadlineJobMonitor(on_update=print)
+    monitor.watch(job_id)
+    ...
+    monitor.wait()  # only command line tools block until the jobs are done
+"""
+
+
+import subprocess
+import threading
+import time
+
+from deadline_integrate import DEADLINE_COMMAND, extract_progress_and_job_status
+
+
+MIN_POLL_INTERVAL = 1.0
+MAX_POLL_INTERVAL = 30.0
+# A transfer still running after this long is reported as timed out
+DEFAULT_JOB_TIMEOUT = 6 * 60 * 60
+# A single deadlinecommand call that hangs longer than this is abandoned
+COMMAND_TIMEOUT = 60
+# Job ids per deadlinecommand call, keeps the command line short
+QUERY_BATCH_SIZE = 100
+
+FINISHED_STATUSES = ("completed", "failed", "suspended", "timeout")
+
+
+def _get_job_details(job_ids, command=None):
+    process = subprocess.run(
+        list(command or [DEADLINE_COMMAND]) + ["-GetJobDetails", ",".join(job_ids)],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        timeout=COMMAND_TIMEOUT,
+    )
+    return process.stdout.split("\n")
+
+
+def split_job_details(lines):
+    """
+    Split the -GetJobDetails output of several jobs into one block per job.
+
+    Jobs are separated by blank lines and every job block has a "Status:"
+    line, which tells it from any other text deadlinecommand prints.
+
+    Args:
+        lines (list): The output lines.
+
+    Returns:
+        list: The line lists of the job blocks, in output order.
+    """
+    blocks = []
+    block = []
+    for line in lines + [""]:
+        if line.strip():
+            block.append(line)
+            continue
+        if any("Status:" in block_line for block_line in block):
+            blocks.append(block)
+        block = []
+    return blocks
+
+
+def query_job_details(job_id, command=None):
+    """
+    Read the progress and status of a Deadline job.
+
+    Args:
+        job_id (str): The Deadline job id.
+        command (list): The deadlinecommand to run, defaults to DEADLINE_COMMAND.
+
+    Returns:
+        tuple: (progress_percent, job_status) as returned by extract_progress_and_job_status.
+    """
+    return extract_progress_and_job_status(_get_job_details([job_id], command))
+
+
+def query_jobs_details(job_ids, command=None, batch_size=QUERY_BATCH_SIZE):
+    """
+    Read the progress and status of many Deadline jobs.
+
+    The ids are passed comma separated to -GetJobDetails, one process per
+    batch_size jobs instead of one per job. When the output of a batch does
+    not split into exactly one block per job, its jobs are asked for one by
+    one, so a surprising output never attributes a status to the wrong job.
+
+    Args:
+        job_ids (list): The Deadline job ids.
+        command (list): The deadlinecommand to run, defaults to DEADLINE_COMMAND.
+        batch_size (int): The number of job ids per call.
+
+    Returns:
+        dict: Job id to (progress_percent, job_status).
+    """
+    details = dict()
+    for start in range(0, len(job_ids), batch_size):
+        batch = list(job_ids[start : start + batch_size])
+        blocks = split_job_details(_get_job_details(batch, command))
+        if len(blocks) == len(batch):
+            for job_id, block in zip(batch, blocks):
+                details[job_id] = extract_progress_and_job_status(block)
+            continue
+
+        print(f"Error: {len(blocks)} job details for {len(batch)} jobs, querying them one by one")
+        for job_id in batch:
+            details[job_id] = query_job_details(job_id, command)
+    return details
+
+
+class DeadlineJobMonitor:
+    """
+    Follows many Deadline jobs from one polling thread.
+
+    Every cycle queries all watched jobs in one batched call, then sleeps.
+    The sleep starts at min_interval and doubles up to max_interval while no
+    job changes, so long transfers cost few deadlinecommand calls, and drops
+    back as soon as one does. A job is dropped once it completes, fails, is suspended or
+    runs past its timeout. The thread only runs while jobs are watched.
+
+    Callbacks are called on the monitor thread as
+    on_update(job_id, job_status, progress_percent); the status of the last
+    call for a job is one of FINISHED_STATUSES.
+
+    Attributes:
+        on_update (callable): The callback of jobs watched without their own.
+        query (callable): Called with a list of job ids, returns job id to
+            (progress_percent, job_status) like query_jobs_details.
+        min_interval (float): The shortest sleep between two cycles.
+        max_interval (float): The longest sleep between two cycles.
+        default_timeout (float): Seconds a job may run when watch() is given no timeout.
+    """
+
+    def __init__(
+        self,
+        on_update=None,
+        query=None,
+        min_interval=MIN_POLL_INTERVAL,
+        max_interval=MAX_POLL_INTERVAL,
+        default_timeout=DEFAULT_JOB_TIMEOUT,
+    ):
+        """
+        Initialize the DeadlineJobMonitor object.
+
+        Args:
+            on_update (callable): The default progress callback.
+            query (callable): The batched job query, defaults to query_jobs_details.
+            min_interval (float): The shortest sleep between two cycles.
+            max_interval (float): The longest sleep between two cycles.
+            default_timeout (float): Seconds a job may run by default.
+        """
+        self.on_update = on_update
+        self.query = query or query_jobs_details
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.default_timeout = default_timeout
+        self._jobs = dict()
+        self._condition = threading.Condition()
+        self._thread = None
+
+    def watch(self, job_id, on_update=None, timeout=None):
+        """
+        Start following a job.
+
+        Args:
+            job_id (str): The Deadline job id, None is reported as failed at once.
+            on_update (callable): The callback of this job, defaults to the monitor's.
+            timeout (float): Seconds until the job is given up, defaults to default_timeout.
+        """
+        callback = on_update or self.on_update
+        if not job_id:
+            # The submission printed no JobID, there is nothing to follow
+            if callback:
+                callback(job_id, "failed", None)
+            return
+
+        with self._condition:
+            self._jobs[job_id] = {
+                "callback": callback,
+                "deadline": time.monotonic() + (timeout or self.default_timeout),
+                "state": None,
+            }
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+            # A new job is polled right away instead of after a long backoff
+            self._condition.notify_all()
+
+    def pending(self):
+        """
+        Return the ids of the jobs still followed.
+
+        Returns:
+            list: The job ids.
+        """
+        with self._condition:
+            return list(self._jobs)
+
+    def wait(self, timeout=None):
+        """
+        Block until every watched job has finished.
+
+        Args:
+            timeout (float): Seconds to wait at most, None waits for as long as it takes.
+
+        Returns:
+            bool: True if no job is left.
+        """
+        with self._condition:
+            return self._condition.wait_for(lambda: not self._jobs, timeout)
+
+    def _run(self):
+        interval = self.min_interval
+        while True:
+            with self._condition:
+                jobs = dict(self._jobs)
+            if not jobs:
+                with self._condition:
+                    if not self._jobs:
+                        self._thread = None
+                        return
+                continue
+
+            changed = self._poll(jobs)
+            interval = self.min_interval if changed else min(interval * 2, self.max_interval)
+            with self._condition:
+                self._condition.wait(interval)
+
+    def _poll(self, jobs):
+        try:
+            details = self.query(list(jobs))
+        except Exception as e:
+            print(f"Error: Deadline job query failed - {e} for {len(jobs)} jobs")
+            details = dict()
+
+        changed = False
+        for job_id, job in jobs.items():
+            progress_percent, job_status = details.get(job_id, (None, "unknown"))
+
+            if job_status not in FINISHED_STATUSES and (progress_percent or 0) >= 100:
+                job_status = "completed"
+            if job_status not in FINISHED_STATUSES and time.monotonic() > job["deadline"]:
+                job_status = "timeout"
+
+            state = (job_status, progress_percent)
+            if state == job["state"]:
+                continue
+            changed = True
+            job["state"] = state
+
+            if job_status in FINISHED_STATUSES:
+                with self._condition:
+                    self._jobs.pop(job_id, None)
+                    self._condition.notify_all()
+            if job["callback"]:
+                try:
+                    job["callback"](job_id, job_status, progress_percent)
+                except Exception as e:
+                    print(f"Error: Deadline job callback failed - {e} for job: {job_id}")
+        return changed
@@ -0,0 +1,81 @@
+"""
+fake_deadlinecommand.py:
+
+A stand-in for Deadline's deadlinecommand, so the Deadline job monitor
+ can be exercised and benchmarked without a farm.
+
+Only -GetJobDetails is implemented. It takes one job id or a comma
+separated list and prints one details block per job, separated by blank
+lines. Every job is a transfer of 10 tasks that progresses with the
+wall clock from a start time derived from its id; ids starting with
+"failed" or "suspended" report that status.
+
+The FAKE_DEADLINE_STARTUP environment variable adds a start up delay in
+seconds, the real deadlinecommand takes about a second to start.
+
+Usage:
+    python fake_deadlinecommand.py -GetJobDetails 65f0c1d2e3,65f0c1d2e4
+"""
+
+
+import os
+import sys
+import time
+import zlib
+
+
+TASKS = 10
+
+
+def job_details(job_id, now):
+    """
+    Build the details block of one fake job.
+
+    Args:
+        job_id (str): The job id.
+        now (float): The current time.
+
+    Returns:
+        str: The details text.
+    """
+    seed = zlib.crc32(job_id.encode())
+    # Every job takes 30 to 330 seconds, started up to 300 seconds ago
+    duration = 30 + seed % 300
+    elapsed = (now - seed % 300) % (duration * 2)
+    done = min(TASKS, int(TASKS * elapsed / duration))
+
+    if job_id.startswith("failed"):
+        status = "Failed"
+    elif job_id.startswith("suspended"):
+        status = "Suspended"
+    elif done >= TASKS:
+        status = "Completed"
+    else:
+        status = "Active"
+
+    percent = 100 * done // TASKS
+    return "\n".join(
+        [
+            "Name: Transfer",
+            "User: pipeline",
+            f"Status: {status}",
+            f"Progress:{percent}% ({done}/{TASKS})",
+            "Pool: pip_pool",
+            "Group: pip",
+        ]
+    )
+
+
+def main(argv):
+    time.sleep(float(os.environ.get("FAKE_DEADLINE_STARTUP", "0")))
+    if len(argv) != 2 or argv[0] != "-GetJobDetails":
+        print("Error: only -GetJobDetails <job id(s)> is supported", file=sys.stderr)
+        return 1
+
+    now = time.time()
+    print("\n\n".join(job_details(job_id, now) for job_id in argv[1].split(",") if job_id))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
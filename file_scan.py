@@ -0,0 +1,341 @@
+"""
+file_scan.py:
+
+This module lists an ingest source tree and groups the files of each
+ directory into file sequences, touching every directory only once.
+
+Classes:
+    ScanStats:
+        Thread safe counters reported by a screening run, e.g. the
+        number of directory listings.
+
+    SequenceIndex:
+        A file name to file sequence lookup of a screened source tree,
+        rebuilt only when a directory of the tree changes.
+
+Functions:
+    list_directory(directory, stats):
+        Lists a directory with a single os.scandir pass and returns
+        its sub directories and visible file names.
+
+    find_sequences_in_directory(directory, file_names):
+        Groups already listed file names into fileseq sequences
+        without going back to the disk.
+
+    directory_mtime(directory):
+        Returns the modification time of a directory, which changes
+        whenever an entry is added, removed or renamed in it.
+
+    walk_sequences(source_path, stats, signature):
+        Walks the source tree top-down and yields the sequences
+        found in every directory.
+
+    walk_sequences_parallel(source_path, handler, max_workers, stats, signature):
+        Lists the source tree on a thread pool, runs handler on
+        the sequences of every directory and returns the results
+        in walk_sequences order.
+
+Usage:
+    for root, sequences in walk_sequences("path/to/delivery"):
+        for seq in sequences:
+            print(root, seq)
+"""
+
+
+import os
+import threading
+
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+
+class ScanStats:
+    """
+    Thread safe counters of a screening run.
+
+    "directory_listings" is counted where a directory is actually listed, so
+    comparing it with "directories" shows that no directory is listed twice.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = Counter()
+
+    def increment(self, name, count=1):
+        """
+        Add to a counter.
+
+        Args:
+            name (str): The counter name.
+            count (int): The amount to add.
+        """
+        with self._lock:
+            self._counts[name] += count
+
+    def as_dict(self):
+        """
+        Return a copy of all counters.
+
+        Returns:
+            dict: Counter name to count.
+        """
+        with self._lock:
+            return dict(self._counts)
+
+    def __getitem__(self, name):
+        with self._lock:
+            return self._counts[name]
+
+
+class SequenceIndex:
+    """
+    File name to file sequence lookup of a screened source tree.
+
+    The keys are the names shown in the Preview column
+    (basename + frame range + extension). The modification time of every
+    directory is recorded before it is listed, so the index is only rebuilt
+    when a directory of the tree gained, lost or renamed an entry.
+
+    Attributes:
+        source_path (str): The root directory the index was built from.
+        sequences (dict): File name to fileseq.FileSequence.
+        signature (dict): Directory path to its st_mtime_ns when it was listed.
+    """
+
+    def __init__(self):
+        """
+        Initialize an empty SequenceIndex object.
+        """
+        self.reset(None)
+
+    @staticmethod
+    def key(seq):
+        """
+        Return the index key of a sequence.
+
+        Args:
+            seq (fileseq.FileSequence): The file sequence.
+
+        Returns:
+            str: The sequence file name, e.g. "plate.1001-1100#.exr".
+        """
+        return seq.basename() + seq.frameRange() + seq.extension()
+
+    def reset(self, source_path):
+        """
+        Empty the index before source_path is walked again.
+
+        Args:
+            source_path (str): The root directory about to be indexed.
+        """
+        self.source_path = source_path
+        self.sequences = dict()
+        self.signature = dict()
+
+    def add(self, seq):
+        """
+        Add a sequence, a later sequence with the same name replaces the earlier one.
+
+        Args:
+            seq (fileseq.FileSequence): The file sequence.
+        """
+        self.sequences[self.key(seq)] = seq
+
+    def get(self, file_name):
+        """
+        Look up a sequence by its file name.
+
+        Args:
+            file_name (str): The sequence file name.
+
+        Returns:
+            fileseq.FileSequence: The sequence, or None.
+        """
+        return self.sequences.get(file_name)
+
+    def is_current(self, source_path):
+        """
+        Check that the index was built from source_path and no directory changed since.
+
+        Args:
+            source_path (str): The root directory the caller expects.
+
+        Returns:
+            bool: True if the index can be used as it is.
+        """
+        if not source_path or source_path != self.source_path:
+            return False
+        return all(
+            directory_mtime(directory) == mtime
+            for directory, mtime in self.signature.items()
+        )
+
+    def ensure(self, source_path):
+        """
+        Rebuild the index if source_path changed on disk or is not the indexed tree.
+
+        Args:
+            source_path (str): The root directory of the delivery.
+        """
+        if self.is_current(source_path):
+            return
+
+        self.reset(source_path)
+        if source_path:
+            for root, sequences in walk_sequences(source_path, signature=self.signature):
+                for seq in sequences:
+                    self.add(seq)
+
+
+def directory_mtime(directory):
+    """
+    Return the modification time of a directory.
+
+    Args:
+        directory (str): The directory path.
+
+    Returns:
+        int: The st_mtime_ns of the directory, or None if it cannot be read.
+    """
+    try:
+        return os.stat(directory).st_mtime_ns
+    except OSError:
+        return None
+
+
+def list_directory(directory, stats=None):
+    """
+    List a directory with one os.scandir pass.
+
+    Hidden files are skipped the same way fileseq.findSequencesOnDisk skips
+    them, and symlinked directories are reported but not descended into,
+    matching os.walk(followlinks=False).
+
+    Args:
+        directory (str): The directory to list.
+        stats (ScanStats): Counts the listing as "directory_listings".
+
+    Returns:
+        tuple: (sub_directories, file_names) where sub_directories is a list of
+            full paths to walk into and file_names a list of visible file names.
+    """
+    sub_directories = []
+    file_names = []
+    if stats is not None:
+        stats.increment("directory_listings")
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+
+                if is_dir:
+                    if not entry.is_symlink():
+                        sub_directories.append(entry.path)
+                elif not entry.name.startswith("."):
+                    file_names.append(entry.name)
+    except OSError as e:
+        print(f"Error: Unable to list directory - {e}")
+
+    return sub_directories, file_names
+
+
+def find_sequences_in_directory(directory, file_names):
+    """
+    Group the file names of a single directory into file sequences.
+
+    This gives the same result as fileseq.findSequencesOnDisk(directory)
+    but works on names that were already listed.
+
+    Args:
+        directory (str): The directory the file names belong to.
+        file_names (list): File names listed from the directory.
+
+    Returns:
+        list: A list of fileseq.FileSequence objects.
+    """
+    if not file_names:
+        return []
+
+    if not directory.endswith(os.sep):
+        directory += os.sep
+
+    import fileseq
+
+    return fileseq.findSequencesInList([directory + name for name in file_names])
+
+
+def walk_sequences(source_path, stats=None, signature=None):
+    """
+    Walk the source tree top-down and yield the sequences of every directory.
+
+    Every directory is listed exactly once; the visiting order is the same
+    as os.walk(source_path).
+
+    Args:
+        source_path (str): The root directory path of the delivery.
+        stats (ScanStats): Counts every directory listing.
+        signature (dict): Filled with the mtime of every directory before it is listed.
+
+    Yields:
+        tuple: (root, sequences) for every directory in the tree.
+    """
+    pending = [source_path]
+    while pending:
+        root = pending.pop()
+        if signature is not None:
+            signature[root] = directory_mtime(root)
+        sub_directories, file_names = list_directory(root, stats)
+        yield root, find_sequences_in_directory(root, file_names)
+        pending.extend(reversed(sub_directories))
+
+
+def walk_sequences_parallel(source_path, handler, max_workers=None, stats=None, signature=None):
+    """
+    Walk the source tree on a thread pool and handle every directory's sequences.
+
+    Listing a directory, grouping its sequences and running the handler all
+    happen on the pool, and sub directories are queued as soon as their
+    parent is listed. Media probing and NFS metadata calls release the GIL,
+    so threads are enough to keep many directories in flight.
+
+    Args:
+        source_path (str): The root directory path of the delivery.
+        handler (callable): Called as handler(root, sequences) on a worker thread.
+        max_workers (int): The size of the thread pool.
+        stats (ScanStats): Counts every directory listing.
+        signature (dict): Filled with the mtime of every directory before it is listed.
+
+    Returns:
+        list: (root, handler_result) tuples in the same order as walk_sequences.
+    """
+
+    def screen(root):
+        if signature is not None:
+            signature[root] = directory_mtime(root)
+        sub_directories, file_names = list_directory(root, stats)
+        sequences = find_sequences_in_directory(root, file_names)
+        return sub_directories, handler(root, sequences)
+
+    children = {}
+    results = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(screen, source_path): source_path}
+        while futures:
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                root = futures.pop(future)
+                children[root], results[root] = future.result()
+                for sub_directory in children[root]:
+                    futures[executor.submit(screen, sub_directory)] = sub_directory
+
+    # Rebuild the top-down order of walk_sequences from the parent/child map
+    ordered = []
+    pending = [source_path]
+    while pending:
+        root = pending.pop()
+        ordered.append((root, results[root]))
+        pending.extend(reversed(children[root]))
+    return ordered
@@ -37,11 +37,12 @@ data containing information for the ingest process.
 import os
 import re
 import struct
-import cv2
-import fileseq
 
-from PIL import Image
-from sg_utils import read
+from sg_cache import department_names
+from file_scan import ScanStats, SequenceIndex, walk_sequences, walk_sequences_parallel
+from table_rules import TableClassifier
+from media_header import read_image_resolution
+from media_cache import MediaCache
 
 
 class ingest_file_screening:
@@ -52,7 +53,11 @@ class ingest_file_screening:
     Attributes:
         department_list (list): A list of Shotgrid department names.
         ingest_data (dict): YAML data containing information for the ingest process.
+        table_classifier (TableClassifier): Table matching rules compiled from ingest_data.
+        media_cache (MediaCache): Persistent cache of probed sequence resolutions.
         load_table_data (dict): A dictionary to store organized data for each table during screening.
+        screening_stats (ScanStats): Directory listing, sequence and probe counters of the last screening.
+        sequence_index (SequenceIndex): File name to sequence lookup of the last screened source tree.
         project_name (str): The name of the project associated with the files.
     """
 
@@ -66,7 +71,14 @@ class ingest_file_screening:
         super(ingest_file_screening, self).__init__()
         self.department_list = get_shotgrid_department_name()
         self.ingest_data = yaml_data
+        self.table_classifier = TableClassifier(yaml_data["Table"]) if yaml_data else None
+        screening_config = (yaml_data or {}).get("Screening", {})
+        self.media_cache = MediaCache(
+            screening_config.get("cache_path"), screening_config.get("cache_size")
+        )
         self.load_table_data = dict()
+        self.screening_stats = ScanStats()
+        self.sequence_index = SequenceIndex()
         self.project_name = None
 
     # class ingest_file_screening:
@@ -78,7 +90,7 @@ class ingest_file_screening:
     #         # self.server_name=None
     #         self.project_name = None
 
-    def separate_the_ingest_files(self, source_path, project_name, server_name):
+    def separate_the_ingest_files(self, source_path, project_name, server_name, workers=None):
         """
         Separate and organize files from the given source_path based on the specified project_name and server_name.
 
@@ -86,6 +98,8 @@ class ingest_file_screening:
             source_path (str): The root directory path containing the files to be ingested.
             project_name (str): The name of the project for which the files are being ingested.
             server_name (str): The name of the server associated with the files.
+            workers (int): The number of screening threads. Defaults to the
+                "Screening" "workers" value of the YAML data, 1 screens serially.
 
         Returns:
             dict: A dictionary containing organized data for each table in the ingest process.
@@ -120,53 +134,40 @@ class ingest_file_screening:
         # Use a dictionary to store sequences based on base name
         sequences = {}
 
-        for root, dirs, files in os.walk(source_path):
-            file_sequence = fileseq.findSequencesOnDisk(root)
-
-            for seq in file_sequence:
-                for key, value in reversed(self.ingest_data["Table"].items()):
-                    filename = os.path.basename(str(seq))
-                    regex = re.search(self.ingest_data["Table"][key]["regex"], filename)
-                    filename_extension = (filename.split(".")[-1]).lower()
-                    table_name = key
-
-                    if len(seq) > 1:
-                        # Check if it's an image sequence based on naming convention
-                        if any(
-                            element in filename.lower()
-                            for element in self.ingest_data["Table"][table_name][
-                                "filter"
-                            ]
-                            or []
-                        ) or (
-                            regex
-                            and filename_extension == "exr"
-                            or filename_extension == "mov"
-                        ):  # Check for sequence
-                            data = self.build_ingest_data(table_name,self.server_name, seq, regex)
-                            self.load_table_data[table_name]["data"].append(data)
-                            self.load_table_data[table_name]["source_path"].append(seq)
-                            break
-                    elif (
-                        filename_extension
-                        in self.ingest_data["Table"][table_name]["extensions"]
-                    ):
-                        data = self.build_ingest_data(table_name, self.server_name , seq, regex)
-                        self.load_table_data[table_name]["data"].append(data)
-                        self.load_table_data[table_name]["source_path"].append(seq)
-                        break
-                else:
-                    if (
-                        filename_extension
-                        in self.ingest_data["Table"][table_name]["extensions"]
-                    ):
-                        data = self.build_ingest_data(table_name, self.server_name,seq, regex)
-                        self.load_table_data[table_name]["data"].append(data)
-                        self.load_table_data[table_name]["source_path"].append(seq)
-                    else:
-                        data = self.build_ingest_data("UnMatched",self.server_name, seq, None)
-                        self.load_table_data["UnMatched"]["data"].append(data)
-                        self.load_table_data["UnMatched"]["source_path"].append(seq)
+        self.screening_stats = ScanStats()
+        self.sequence_index.reset(source_path)
+        signature = self.sequence_index.signature
+        if workers is None:
+            workers = self.ingest_data.get("Screening", {}).get("workers", 1)
+
+        if workers and workers > 1:
+            # Directories are listed and screened on a worker pool, the results
+            # come back in os.walk order so the tables match a serial run
+            screened = walk_sequences_parallel(
+                source_path,
+                self.screen_directory_sequences,
+                workers,
+                self.screening_stats,
+                signature,
+            )
+        else:
+            # Every directory is listed once and its sequences are grouped in memory
+            screened = (
+                (root, self.screen_directory_sequences(root, file_sequence))
+                for root, file_sequence in walk_sequences(
+                    source_path, self.screening_stats, signature
+                )
+            )
+
+        for root, rows in screened:
+            self.screening_stats.increment("directories")
+            for table_name, data, seq in rows:
+                self.screening_stats.increment("sequences")
+                self.sequence_index.add(seq)
+                self.load_table_data[table_name]["data"].append(data)
+                self.load_table_data[table_name]["source_path"].append(seq)
+
+        self.media_cache.flush()
 
         # Process accumulated sequences
         for base_name, seq_list in sequences.items():
@@ -186,6 +187,26 @@ class ingest_file_screening:
 
         return self.load_table_data
 
+    def screen_directory_sequences(self, root, file_sequence):
+        """
+        Match the sequences of one directory against the ingest tables and build their row data.
+
+        Args:
+            root (str): The directory the sequences were found in.
+            file_sequence (list): The fileseq.FileSequence objects of the directory.
+
+        Returns:
+            list: A list of (table_name, data, seq) tuples in the order of file_sequence.
+        """
+        rows = []
+        for seq in file_sequence:
+            filename = os.path.basename(str(seq))
+            table_name, regex = self.table_classifier.classify(filename, len(seq) > 1)
+            data = self.build_ingest_data(table_name, self.server_name, seq, regex)
+            rows.append((table_name, data, seq))
+
+        return rows
+
     # def separate_the_ingest_files(self, source_path, project_name, server_name):
     #     self.server_name = server_name
     #     self.project_name = project_name
@@ -310,7 +331,7 @@ class ingest_file_screening:
                     ),
                     "Version": "v###",
                     "Extension": seq.extension()[1:],
-                    "Res": self.get_asset_resolution(str(seq)),
+                    "Res": self.get_asset_resolution(seq),
                     "Preview": seq.basename() + seq.frameRange() + seq.extension(),
                 }
 
@@ -432,12 +453,18 @@ class ingest_file_screening:
 
     #     return self.ingest_data["Table"][table_name]["path"].format(**preview_dict)
 
-    def get_asset_resolution(self, path):
+    def get_asset_resolution(self, seq):
         """
-        Get the resolution of the file using the OpenCV method.
+        Get the resolution of the file from its image header, falling back on OpenCV.
+
+        The first frame of the sequence is probed directly, so no directory is
+        listed here. EXR, DPX, TIFF, PNG and JPEG resolutions are read from the
+        first few KB of the file; movies and unknown image headers are still
+        opened with OpenCV. Probed resolutions are kept in the media cache, so
+        unchanged files are never probed twice.
 
         Args:
-            path (str): The path of the file for which the resolution needs to be determined.
+            seq (fileseq.FileSequence): The sequence for which the resolution needs to be determined.
 
         Returns:
             str: A string representing the resolution in the format "width x height".
@@ -447,45 +474,75 @@ class ingest_file_screening:
         plate_ext = self.ingest_data["Table"]["Plate"]["extensions"]
         annotation_ext = self.ingest_data["Table"]["Annotations"]["extensions"]
         img_seq = [*plate_ext, *annotation_ext]
-        base_path = os.path.dirname(path)
+        base_path = os.path.dirname(str(seq))
+
+        img_file = seq.index(0)
+        exten = (os.path.splitext(img_file)[-1][1:]).lower()
 
-        for file in os.listdir(base_path):
-            img_file = os.path.join(base_path, file)
-            exten = (os.path.splitext(img_file)[-1][1:]).lower()
+        if exten not in mov_file and exten not in img_seq:
+            return res
 
-            if exten:
-                if exten in img_seq:
-                    break
+        # An unchanged sample frame means the cached resolution is still right
+        try:
+            stat = os.stat(img_file)
+        except OSError as e:
+            print(f"Error: Unable to stat file - {e} for file: {img_file}")
+            return res
 
-        if exten in mov_file:
+        pattern = os.path.basename(str(seq))
+        cached = self.media_cache.get(base_path, pattern, stat.st_size, stat.st_mtime_ns)
+        if cached:
+            self.screening_stats.increment("cache_hits")
+            return cached
+
+        self.screening_stats.increment("media_probes")
+        probed = self.probe_resolution(img_file, exten in mov_file)
+        if probed:
+            self.media_cache.put(base_path, pattern, stat.st_size, stat.st_mtime_ns, probed)
+            res = probed
+
+        return res
+
+    def probe_resolution(self, img_file, is_movie=False):
+        """
+        Probe the resolution of a single media file.
+
+        Args:
+            img_file (str): The path of the frame or movie file.
+            is_movie (bool): True to open the file as a video with OpenCV.
+
+        Returns:
+            str: The resolution in the format "widthxheight", or None if it could not be read.
+        """
+        # OpenCV takes a second to import, most sessions never need it
+        import cv2
+
+        res = None
+        if is_movie:
             vid = cv2.VideoCapture(img_file)
             hgt = vid.get(cv2.CAP_PROP_FRAME_HEIGHT)
             wid = vid.get(cv2.CAP_PROP_FRAME_WIDTH)
-            res = f"{int(wid)}x{int(hgt)}"
-        elif exten in img_seq:
-            if exten == "dpx":
-                try:
-                    with open(img_file, "rb") as file:
-                        # Read the magic number from the file header to determine endianness
-                        magic_number = struct.unpack("I", file.read(4))[0]
-                        # Set the endianness for reading the values
-                        endianness = ">" if magic_number == 1481655379 else "<"
-                        # Seek to x/y offset in the header (1424 bytes for x, 1428 bytes for y)
-                        file.seek(1424, 0)
-                        # Read x and y resolutions (4 bytes each) based on endianness
-                        width = struct.unpack(endianness + "I", file.read(4))[0]
-                        height = struct.unpack(endianness + "I", file.read(4))[0]
-                        res = f"{width}x{height}"
-                except FileNotFoundError as e:
-                    print(f"Error: File not found - {e} for file: {img_file}")
-                except PermissionError as e:
-                    print(f"Error: Permission issue - {e} for file: {img_file}")
-                except struct.error as e:
-                    print(f"Error: Struct error - {e} for file: {img_file}")
-                except Exception as e:
-                    print(
-                        f"An unexpected error occurred in 'dpx' condition: {e} for file: {img_file}"
-                    )
+            if wid and hgt:
+                res = f"{int(wid)}x{int(hgt)}"
+        else:
+            # Only the header is read, cv2 decodes the frame when the header is not understood
+            resolution = None
+            try:
+                resolution = read_image_resolution(img_file)
+            except FileNotFoundError as e:
+                print(f"Error: File not found - {e} for file: {img_file}")
+            except PermissionError as e:
+                print(f"Error: Permission issue - {e} for file: {img_file}")
+            except struct.error as e:
+                print(f"Error: Struct error - {e} for file: {img_file}")
+            except Exception as e:
+                print(
+                    f"An unexpected error occurred while reading the header: {e} for file: {img_file}"
+                )
+
+            if resolution:
+                width, height = resolution
+                res = f"{width}x{height}"
             else:
                 try:
                     img = cv2.imread(img_file)
@@ -566,19 +623,13 @@ def get_shotgrid_department_name():
 
     This function queries Shotgrid to obtain department details, filters out
     departments with underscores in their names, and returns the sorted list
-    of department names.
+    of department names. The list comes from the ShotGrid metadata cache, so
+    only the first launch waits for the query.
 
     Returns:
         list: A sorted list of Shotgrid department names without underscores.
     """
-    # Consider changing the name of 'read' to a more descriptive name if possible
-    shotgrid_reader = read  # Replace 'read' with the actual module/class you are using
-    departments = shotgrid_reader._get_details("Department", [], ["name"])
-    filtered_departments = [
-        dept["name"] for dept in departments if "_" not in dept["name"]
-    ]
-    sorted_departments = sorted(filtered_departments, key=len)
-    return sorted_departments
+    return department_names()
 
 
 # def get_shotgrid_department_name():
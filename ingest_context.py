@@ -0,0 +1,79 @@
+"""
+ingest_context.py:
+
+This module defines the IngestContext class, which holds the state the
+ main window and the ingest tables share: the selected show and server,
+   the source path and the live tables.
+
+Classes:
+    IngestContext:
+        Kept up to date by IngestApp from its widgets and read by the
+        tables, instead of every lookup scanning QApplication.allWidgets().
+
+Usage:
+    context = IngestContext(server="brahmos")
+    show_combo_box.currentTextChanged.connect(context.set_show)
+    context.add_table(table)
+    for table in context.tables.values():
+        ...
+"""
+
+
+class IngestContext:
+    """
+    Shared state of one ingest window.
+
+    Attributes:
+        show (str): The text of the show combobox.
+        server (str): The text of the server combobox.
+        source_path (str): The delivery folder being ingested.
+        tables (dict): Table name to the IngestTableView shown in its tab.
+    """
+
+    def __init__(self, show="", server="", source_path=""):
+        """
+        Initialize the IngestContext object.
+
+        Args:
+            show (str): The initial show.
+            server (str): The initial server.
+            source_path (str): The initial source path.
+        """
+        self.show = show
+        self.server = server
+        self.source_path = source_path
+        self.tables = dict()
+
+    def set_show(self, show):
+        self.show = show
+
+    def set_server(self, server):
+        self.server = server
+
+    def set_source_path(self, source_path):
+        self.source_path = source_path
+
+    @property
+    def project_name(self):
+        """
+        Return the show as the upper case project name the paths are built with.
+
+        Returns:
+            str: The project name.
+        """
+        return self.show.upper()
+
+    def add_table(self, table):
+        """
+        Register a table under its object name, replacing any table of that name.
+
+        Args:
+            table (IngestTableView): The table.
+        """
+        self.tables[table.objectName()] = table
+
+    def clear_tables(self):
+        """
+        Forget every table, before the tabs are built for a new delivery.
+        """
+        self.tables = dict()
@@ -0,0 +1,446 @@
+"""
+ingest_model.py:
+
+This module defines the IngestTableModel class, which holds the rows of an
+ ingest table in compact column arrays, and the IngestItemDelegate that draws
+   its cells and edits its list-typed ones, so a table of thousands of rows
+     creates no widget or item per cell.
+
+Classes:
+    IngestTableModel:
+        A QAbstractTableModel storing the checkbox column, the text columns
+        and the combobox columns (e.g. Dept) of an ingest table.
+
+    IngestItemDelegate:
+        Paints combobox cells and the status borders of the visible cells,
+        and opens a QComboBox editor on the one cell being edited.
+
+Usage:
+    model = IngestTableModel(headers)
+    model.append_rows(file_screen_rows)
+    view.setModel(model)
+    view.setItemDelegate(IngestItemDelegate(view))
+"""
+
+
+import sys
+
+from array import array
+
+from PySide2 import QtCore
+from PySide2 import QtGui
+from PySide2 import QtWidgets
+
+
+# data() role returning the options of a combobox cell
+CHOICES_ROLE = QtCore.Qt.UserRole + 1
+
+# The view asks for about ten roles per painted cell, plain ints keep data() cheap
+_TEXT_ROLES = frozenset((int(QtCore.Qt.DisplayRole), int(QtCore.Qt.EditRole)))
+_CHECK_STATE_ROLE = int(QtCore.Qt.CheckStateRole)
+_STATUS_ROLE = int(QtCore.Qt.UserRole)
+_CHOICES_ROLE = int(CHOICES_ROLE)
+_CHECKBOX_FLAGS = QtCore.Qt.ItemIsEnabled | QtCore.Qt.ItemIsSelectable | QtCore.Qt.ItemIsUserCheckable
+_CELL_FLAGS = QtCore.Qt.ItemIsEnabled | QtCore.Qt.ItemIsSelectable | QtCore.Qt.ItemIsEditable
+
+
+class IngestTableModel(QtCore.QAbstractTableModel):
+    """
+    Table model of one ingest table.
+
+    Column 0 is the "Enable" checkbox. A column whose value in the first
+    row is a list (the screening puts the department list there) is a
+    combobox column, every other column holds text. Every column is one
+    array: a list of interned strings for text, and for a combobox column
+    the index of the row's option list plus the selected option, so equal
+    option lists are stored once whatever the number of rows.
+
+    Status colours (edited, missing, published...) are kept per row, as
+    None or a dict of column index to colour, and read by the delegate
+    while it paints a cell.
+
+    cell_edited is emitted when the value of a cell changes through
+    setData(), whether the user edited it or a helper set it.
+
+    Attributes:
+        headers (list): The column names.
+        checked (array.array): 1 for every checked row, 0 otherwise.
+        columns (list): Per column, the cell texts or the selected option indexes.
+        option_ids (dict): Combobox column index to the option list index of every row.
+        option_sets (list): The distinct option lists, as tuples.
+        statuses (list): Per row, None or a dict of column index to the QColor
+            of a cell's status border.
+    """
+
+    cell_edited = QtCore.Signal(int, int)
+
+    def __init__(self, headers, parent=None):
+        """
+        Initialize the IngestTableModel object.
+
+        Args:
+            headers (list): The column names.
+            parent (QtCore.QObject): The parent object.
+        """
+        super(IngestTableModel, self).__init__(parent)
+        self.headers = list(headers)
+        self.checked = array("b")
+        self.columns = None
+        self.option_ids = dict()
+        self.option_sets = []
+        self._option_set_index = dict()
+        self.statuses = []
+        self._status_colors = dict()
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.checked)
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.headers)
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        if role == QtCore.Qt.DisplayRole and orientation == QtCore.Qt.Horizontal:
+            return self.headers[section]
+        return super(IngestTableModel, self).headerData(section, orientation, role)
+
+    def flags(self, index):
+        if not index.isValid():
+            return QtCore.Qt.NoItemFlags
+        return _CHECKBOX_FLAGS if index.column() == 0 else _CELL_FLAGS
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if role in _TEXT_ROLES:
+            column = index.column()
+            return self.cell_text(index.row(), column) if column else None
+        if role == _CHECK_STATE_ROLE:
+            if index.column() == 0:
+                return QtCore.Qt.Checked if self.checked[index.row()] else QtCore.Qt.Unchecked
+            return None
+        if role == _STATUS_ROLE:
+            status = self.statuses[index.row()]
+            return status.get(index.column()) if status else None
+        if role == _CHOICES_ROLE and self.is_choice_column(index.column()):
+            return list(self.option_sets[self.option_ids[index.column()][index.row()]])
+        return None
+
+    def setData(self, index, value, role=QtCore.Qt.EditRole):
+        if not index.isValid():
+            return False
+        row, column = index.row(), index.column()
+
+        if role == QtCore.Qt.CheckStateRole and column == 0:
+            self.checked[row] = 1 if QtCore.Qt.CheckState(value) == QtCore.Qt.Checked else 0
+            self.dataChanged.emit(index, index, [role])
+            return True
+
+        if role == QtCore.Qt.UserRole:
+            status = self.statuses[row]
+            if value is None:
+                if status:
+                    status.pop(column, None)
+            else:
+                if status is None:
+                    status = self.statuses[row] = dict()
+                status[column] = self._status_color(value)
+            self.dataChanged.emit(index, index, [role])
+            return True
+
+        if role != QtCore.Qt.EditRole or column == 0:
+            return False
+
+        text = "" if value is None else str(value)
+        if self.is_choice_column(column):
+            options = self.option_sets[self.option_ids[column][row]]
+            if text not in options:
+                return False
+            value = options.index(text)
+        else:
+            value = sys.intern(text)
+
+        # Setting the same value again is not an edit, like QTableWidgetItem
+        if self.columns[column][row] == value:
+            return True
+        self.columns[column][row] = value
+        self.dataChanged.emit(index, index, [QtCore.Qt.DisplayRole, QtCore.Qt.EditRole])
+        self.cell_edited.emit(row, column)
+        return True
+
+    def is_choice_column(self, column):
+        """
+        Tell whether a column holds comboboxes.
+
+        Args:
+            column (int): The column index.
+
+        Returns:
+            bool: True for a combobox column.
+        """
+        return column in self.option_ids
+
+    def column_index(self, header):
+        """
+        Return the index of a column.
+
+        Args:
+            header (str): The column name.
+
+        Returns:
+            int: The column index, or None.
+        """
+        return self.headers.index(header) if header in self.headers else None
+
+    def _status_color(self, color):
+        # One QColor per colour name, shared by every cell with that status
+        color = QtGui.QColor(color)
+        return self._status_colors.setdefault(color.name(), color)
+
+    def _option_set(self, options):
+        options = tuple(str(option) for option in options)
+        option_set = self._option_set_index.get(options)
+        if option_set is None:
+            option_set = self._option_set_index[options] = len(self.option_sets)
+            self.option_sets.append(options)
+        return option_set
+
+    def append_rows(self, rows):
+        """
+        Add rows at the end of the table, every row checked.
+
+        Args:
+            rows (list): The rows, each a list of values in column order as
+                built by ingest_file_screening.build_ingest_data.
+        """
+        rows = [row for row in rows if row]
+        if not rows:
+            return
+
+        if self.columns is None:
+            # The first rows decide which columns are comboboxes
+            self.columns = [None]
+            for column in range(1, len(self.headers)):
+                if isinstance(rows[0][column], list):
+                    self.option_ids[column] = array("H")
+                    self.columns.append(array("H"))
+                else:
+                    self.columns.append([])
+
+        start = len(self.checked)
+        self.beginInsertRows(QtCore.QModelIndex(), start, start + len(rows) - 1)
+        self.checked.extend([1] * len(rows))
+        self.statuses.extend([None] * len(rows))
+        for column in range(1, len(self.headers)):
+            values = self.columns[column]
+            if self.is_choice_column(column):
+                option_ids = self.option_ids[column]
+                for row in rows:
+                    value = row[column]
+                    option_ids.append(self._option_set(value if isinstance(value, list) else [value]))
+                    values.append(0)
+            else:
+                values.extend(sys.intern(str(row[column])) for row in rows)
+        self.endInsertRows()
+
+    def remove_rows(self, row_indexes):
+        """
+        Remove rows, in as few removals as there are runs of adjacent rows.
+
+        Args:
+            row_indexes (list): The indexes of the rows to remove.
+        """
+        ranges = []
+        for row in sorted(set(row_indexes), reverse=True):
+            if ranges and ranges[-1][0] == row + 1:
+                ranges[-1][0] = row
+            else:
+                ranges.append([row, row])
+
+        for start, end in ranges:
+            self.beginRemoveRows(QtCore.QModelIndex(), start, end)
+            del self.checked[start : end + 1]
+            for column in range(1, len(self.headers)):
+                del self.columns[column][start : end + 1]
+            for option_ids in self.option_ids.values():
+                del option_ids[start : end + 1]
+            del self.statuses[start : end + 1]
+            self.endRemoveRows()
+
+    def clear(self):
+        """
+        Remove every row.
+        """
+        self.beginResetModel()
+        self.checked = array("b")
+        self.columns = None
+        self.option_ids = dict()
+        self.option_sets = []
+        self._option_set_index = dict()
+        self.statuses = []
+        self.endResetModel()
+
+    def is_checked(self, row):
+        """
+        Tell whether a row is checked.
+
+        Args:
+            row (int): The row index.
+
+        Returns:
+            bool: True if the row's checkbox is checked.
+        """
+        return bool(self.checked[row])
+
+    def checked_rows(self):
+        """
+        Return the indexes of the checked rows.
+
+        Returns:
+            list: The row indexes, in table order.
+        """
+        return [row for row, checked in enumerate(self.checked) if checked]
+
+    def set_all_checked(self, checked):
+        """
+        Check or uncheck every row.
+
+        Args:
+            checked (bool): The new state of the checkboxes.
+        """
+        if not self.checked:
+            return
+        self.checked = array("b", [1 if checked else 0]) * len(self.checked)
+        self.dataChanged.emit(
+            self.index(0, 0), self.index(len(self.checked) - 1, 0), [QtCore.Qt.CheckStateRole]
+        )
+
+    def cell_text(self, row, column):
+        """
+        Return the text of a cell, the selected option of a combobox cell.
+
+        Args:
+            row (int): The row index.
+            column (int): The column index, not 0.
+
+        Returns:
+            str: The cell text.
+        """
+        if self.is_choice_column(column):
+            options = self.option_sets[self.option_ids[column][row]]
+            return options[self.columns[column][row]] if options else ""
+        return self.columns[column][row]
+
+    def set_cell_text(self, row, column, text):
+        """
+        Set the text of a cell, or select an option of a combobox cell.
+
+        Args:
+            row (int): The row index.
+            column (int): The column index, not 0.
+            text (str): The new text.
+
+        Returns:
+            bool: False if a combobox cell has no such option.
+        """
+        return self.setData(self.index(row, column), text)
+
+    def row_values(self, row):
+        """
+        Return the values of a row by column name, the checkbox column excluded.
+
+        Args:
+            row (int): The row index.
+
+        Returns:
+            dict: Column name to cell text.
+        """
+        return {
+            self.headers[column]: self.cell_text(row, column)
+            for column in range(1, len(self.headers))
+        }
+
+    def set_cell_color(self, row, column, color):
+        """
+        Set the status border colour of a cell.
+
+        Args:
+            row (int): The row index.
+            column (int): The column index.
+            color (str): The colour name, None removes the border.
+        """
+        self.setData(self.index(row, column), color, QtCore.Qt.UserRole)
+
+
+class IngestItemDelegate(QtWidgets.QStyledItemDelegate):
+    """
+    Item delegate of IngestTableView.
+
+    Combobox cells are drawn as comboboxes, with a real QComboBox only while
+    one is edited; other cells are left to QStyledItemDelegate, which draws
+    the text and the checkbox of column 0. The status colour of a cell is
+    drawn as a border on top, so only the visible cells ever look it up.
+    """
+
+    def __init__(self, parent=None):
+        """
+        Initialize the IngestItemDelegate object.
+
+        Args:
+            parent (QtCore.QObject): The parent object, usually the view.
+        """
+        super(IngestItemDelegate, self).__init__(parent)
+        # Reused for every painted cell
+        self._combo_option = QtWidgets.QStyleOptionComboBox()
+
+    def paint(self, painter, option, index):
+        if index.model().is_choice_column(index.column()):
+            self.paint_combo_box(painter, option, index)
+        else:
+            super(IngestItemDelegate, self).paint(painter, option, index)
+
+        color = index.data(QtCore.Qt.UserRole)
+        if color is not None:
+            painter.save()
+            painter.setPen(QtGui.QPen(color, 3))
+            # Inside the cell, so the next cell painted does not cover half of it
+            painter.drawRect(option.rect.adjusted(1, 1, -2, -2))
+            painter.restore()
+
+    def paint_combo_box(self, painter, option, index):
+        combo_option = self._combo_option
+        combo_option.rect = option.rect
+        combo_option.state = option.state | QtWidgets.QStyle.State_Enabled
+        combo_option.currentText = index.data(QtCore.Qt.DisplayRole) or ""
+        style = option.widget.style() if option.widget else QtWidgets.QApplication.style()
+        style.drawComplexControl(QtWidgets.QStyle.CC_ComboBox, combo_option, painter)
+        style.drawControl(QtWidgets.QStyle.CE_ComboBoxLabel, combo_option, painter)
+
+    def createEditor(self, parent, option, index):
+        options = index.data(CHOICES_ROLE)
+        if options is None:
+            return super(IngestItemDelegate, self).createEditor(parent, option, index)
+
+        editor = QtWidgets.QComboBox(parent)
+        editor.addItems(options)
+        # A pick commits at once, like the combobox cells of the old table
+        editor.activated.connect(lambda _: self.commit_and_close(editor))
+        QtCore.QTimer.singleShot(0, editor.showPopup)
+        return editor
+
+    def commit_and_close(self, editor):
+        self.commitData.emit(editor)
+        self.closeEditor.emit(editor)
+
+    def setEditorData(self, editor, index):
+        if isinstance(editor, QtWidgets.QComboBox):
+            editor.setCurrentText(index.data(QtCore.Qt.EditRole))
+            return
+        super(IngestItemDelegate, self).setEditorData(editor, index)
+
+    def setModelData(self, editor, model, index):
+        if isinstance(editor, QtWidgets.QComboBox):
+            model.setData(index, editor.currentText())
+            return
+        super(IngestItemDelegate, self).setModelData(editor, model, index)
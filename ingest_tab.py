@@ -1,13 +1,11 @@
 from PySide2 import QtWidgets
 
-from utils.config import ConfigTableView
+from app_config import get_yaml_data
 from ingest_table import IngestTableView
 
-yaml_data = ConfigTableView().load_yaml_data()
-
 
 class IngestTabView(QtWidgets.QTabWidget):
-    def __init__(self, app):
+    def __init__(self, app, context):
         super(IngestTabView, self).__init__()
         self.setStyleSheet(
             """
@@ -35,6 +33,7 @@ class IngestTabView(QtWidgets.QTabWidget):
         """
         )
         self.app = app
+        self.context = context
         self.add_tab_button = QtWidgets.QPushButton("+")
         self.add_tab_button.setStyleSheet(
             """
@@ -50,10 +49,15 @@ class IngestTabView(QtWidgets.QTabWidget):
 
     def add_tab_menu_item_clicked(self, action):
         table_name = action.text()
-        headers = yaml_data["Table"][table_name]["table_head"]
+        headers = get_yaml_data()["Table"][table_name]["table_head"]
         table_object = IngestTableView(
-            table_head=table_name, data=None, headers=headers, app=self.app
+            table_head=table_name,
+            data=None,
+            headers=headers,
+            app=self.app,
+            context=self.context,
         )
+        self.context.add_table(table_object)
         layout = QtWidgets.QVBoxLayout()
         layout.addWidget(table_object)
         tab = QtWidgets.QWidget()
@@ -68,6 +72,7 @@ class IngestTabView(QtWidgets.QTabWidget):
         if ingest_data:
             self.file_screen_source_path = ingest_data
             self.clear()
+            self.context.clear_tables()
             self.menu = QtWidgets.QMenu(self)
             self.menu.triggered.connect(self.add_tab_menu_item_clicked)
             for key, value in ingest_data.items():
@@ -77,7 +82,9 @@ class IngestTabView(QtWidgets.QTabWidget):
                         data=value["data"],
                         headers=value["column_head"],
                         app=self.app,
+                        context=self.context,
                     )
+                    self.context.add_table(table_object)
       
                     layout = QtWidgets.QVBoxLayout()
                     layout.addWidget(table_object)
@@ -3,10 +3,6 @@ import os
 from PySide2 import QtWidgets
 from PySide2 import QtGui
 
-from utils.config import ConfigTableView
-
-yaml_data = ConfigTableView().load_yaml_data()
-
 
 class IngestTreeView(QtWidgets.QTreeView):
     def __init__(self, app, parent=None):
@@ -1,30 +1,30 @@
 import os
-import re
 import sys
 import time  # Added import
 
 from PySide2 import QtWidgets, QtGui, QtCore
 import ui.ingest_ui as _ui
-import fileseq
 
 os.environ["OPENCV_IO_ENABLE_OPENEXR"] = "1"
 
 # Import your other modules as needed
 # from jobsetup import __shots as shots
-from jobsetup import new_shots as shots
-from sg_utils import create, read
-from utils.config import ConfigTableView
+from sg_cache import project_names, reload_project_names
+from app_config import get_file_screen, get_yaml_data
+from ingest_context import IngestContext
 from ingest_tab import IngestTabView
 from ingest_tree import IngestTreeView
-from file_screen import ingest_file_screening
 from utils.logger import get_logger
-from file_utils.file_op import copy_file_seq, copy_file
-from deadline_integrate import deadline_ingest
-
-yaml_data = ConfigTableView().load_yaml_data()
+from publish_worker import PublishWorker
+from deadline_monitor import DeadlineJobMonitor, FINISHED_STATUSES
+from shot_provision import ShotProvisioner
+from version_index import PublishedVersionQuery
 
 
 class IngestApp(_ui.Ui_MainWindow, QtWidgets.QMainWindow):
+    # Deadline transfer updates, emitted from the monitor thread
+    transfer_status = QtCore.Signal(str, str, object)
+
     def __init__(self):
         """
         Initialize the IngestApp.
@@ -32,8 +32,8 @@ class IngestApp(_ui.Ui_MainWindow, QtWidgets.QMainWindow):
         This constructor sets up the IngestApp, initializes UI components, and connects UI elements.
 
         - Sets up the user interface using 'setupUi'.
-        - Creates an 'IngestTreeView' and 'IngestTabView' instance.
-        - Initializes file screening with the provided YAML data.
+        - Creates the 'IngestContext' shared with the tables, and an 'IngestTreeView' and 'IngestTabView' instance.
+        - File screening is created on first use by 'get_file_screen'.
         - Sets 'project_name' to None initially.
         - Retrieves the initial value for 'server_name' from the 'server_comboBox'.
         - Calls 'InitializeUI' to perform additional UI setup.
@@ -47,11 +47,24 @@ class IngestApp(_ui.Ui_MainWindow, QtWidgets.QMainWindow):
         """
         super(IngestApp, self).__init__()
         self.setupUi(self)
-        self.IngestTreeView = IngestTreeView(app)
-        self.IngestTabView = IngestTabView(app)
-        self.file_screen = ingest_file_screening(yaml_data)
         self.project_name = None
         self.server_name = self.server_comboBox.currentText()
+        # Show, server, source path and tables, looked up by the tables without scanning widgets
+        self.context = IngestContext(
+            show=self.show_comboBox.currentText(),
+            server=self.server_name,
+            source_path=self.ingest_source_path_line_edit.text(),
+        )
+        self.IngestTreeView = IngestTreeView(app)
+        self.IngestTabView = IngestTabView(app, self.context)
+        self.publish_worker = None
+        # Shared by every publish, so a shot is only created once per session
+        self.shot_provisioner = ShotProvisioner(
+            max_workers=get_yaml_data().get("Publish", {}).get("shot_workers")
+        )
+        # Follows the Deadline transfers of every publish on one background thread
+        self.deadline_monitor = DeadlineJobMonitor(on_update=self.transfer_status.emit)
+        self.transfer_status.connect(self.SetTransferStatus)
         self.InitializeUI()
         self.connect_ui()
 
@@ -65,6 +78,7 @@ class IngestApp(_ui.Ui_MainWindow, QtWidgets.QMainWindow):
         - The 'Cancel' button is connected to the 'ClearAllTableData' function.
         - The 'Validate' button is connected to the 'ValidateTableData' function.
         - The 'Publish' button is connected to the 'PublishIngestFiles' function.
+        - The show, server and source path widgets keep the 'IngestContext' up to date.
 
         Note:
         Ensure that the 'ingest_browse_button' is initially disabled.
@@ -80,6 +94,9 @@ class IngestApp(_ui.Ui_MainWindow, QtWidgets.QMainWindow):
         self.ingest_cancel_button.clicked.connect(self.ClearAllTableData)
         self.ingest_validate_button.clicked.connect(self.ValidateTableData)
         self.ingest_publish_button.clicked.connect(self.PublishIngestFiles)
+        self.show_comboBox.currentTextChanged.connect(self.context.set_show)
+        self.server_comboBox.currentTextChanged.connect(self.context.set_server)
+        self.ingest_source_path_line_edit.textChanged.connect(self.context.set_source_path)
 
     def PopUpFileDialog(self):
         """
@@ -94,6 +111,11 @@ class IngestApp(_ui.Ui_MainWindow, QtWidgets.QMainWindow):
         5. Screens the ingest files using the file screening process.
         6. Creates tabs and tables in the 'IngestTabView' based on the screened ingest data.
         """
+        if self.publish_worker is not None:
+            # The running publish still colours the rows of the current tables
+            self.DialogBox("Warning", "A publish is already running")
+            return
+
         file_dialog = QtWidgets.QFileDialog(self)
         source_url = file_dialog.getExistingDirectoryUrl(
             parent=self,
@@ -105,7 +127,7 @@ class IngestApp(_ui.Ui_MainWindow, QtWidgets.QMainWindow):
         if self.source_path:
             self.ingest_source_path_line_edit.setText(self.source_path)
             self.IngestTreeView.set_context_data(self.source_path)
-            self.ingest_data = self.file_screen.separate_the_ingest_files(
+            self.ingest_data = get_file_screen().separate_the_ingest_files(
                 self.source_path, self.project_name, self.server_name
             )
 
@@ -121,8 +143,9 @@ class IngestApp(_ui.Ui_MainWindow, QtWidgets.QMainWindow):
         2. Configures and adds the QSplitter to the 'ingest_context_layout'.
         3. Configures the 'show_comboBox':
         - Makes it editable.
-        - Populates the dropdown with project names retrieved from 'read.Projects().projects'.
+        - Populates the dropdown with project names from the ShotGrid metadata cache.
         - Connects the 'currentTextChanged' signal to the 'validate_show_comboBox' method.
+        - Reloads the project names when an unknown show is entered, see 'reload_show_list'.
 
         4. Configures the 'server_comboBox':
         - Makes it editable.
@@ -139,10 +162,11 @@ class IngestApp(_ui.Ui_MainWindow, QtWidgets.QMainWindow):
 
         # Configure show_comboBox
         self.show_comboBox.setEditable(True)
-        self.show_list = [project["name"] for project in read.Projects().projects]
+        self.show_list = list(project_names())
         self.show_list.insert(0, "")
         self.show_comboBox.addItems(self.show_list)
         self.show_comboBox.currentTextChanged.connect(self.validate_show_comboBox)
+        self.show_comboBox.lineEdit().editingFinished.connect(self.reload_show_list)
 
         # Configure server_comboBox
         self.server_comboBox.setEditable(True)
@@ -181,6 +205,31 @@ class IngestApp(_ui.Ui_MainWindow, QtWidgets.QMainWindow):
             self.ingest_browse_button.setEnabled(False)
             self.show_comboBox.setStyleSheet("QComboBox { border: 3px solid red; }")
 
+    def reload_show_list(self):
+        """
+        Reload the project names when the entered show is not in the cached list.
+
+        The project names are cached for a day, so a show created since then is
+        only found after a reload. It runs once the show is entered, not on every
+        keystroke, and the new projects are added to the 'show_comboBox'.
+        """
+        project_name = self.show_comboBox.currentText()
+        if not project_name or project_name in self.show_list:
+            return
+
+        try:
+            names = reload_project_names()
+        except Exception as e:
+            print(f"Error: Project names not reloaded - {e}")
+            return
+
+        new_names = [name for name in names if name not in self.show_list]
+        if new_names:
+            self.show_list.extend(new_names)
+            self.show_comboBox.addItems(new_names)
+            self.show_comboBox.setEditText(project_name)
+        self.validate_show_comboBox(self.show_comboBox.currentIndex())
+
     def validate_server_comboBox(self, index):
         """
         Validate the selected item in the 'server_comboBox'.
@@ -212,17 +261,13 @@ class IngestApp(_ui.Ui_MainWindow, QtWidgets.QMainWindow):
         """
         Clear all data in QTableViews within the application.
 
-        This method iterates over all widgets in the application. If a widget is a QTableView:
-        - Sets the row count to 0.
-        - Sets the column count to 0.
+        This method iterates over the tables of the 'IngestContext':
+        - Removes every row of its model.
 
         Additionally, it resets the data in the 'IngestTreeView'.
         """
-        widgets = app.allWidgets()
-        for widget in widgets:
-            if isinstance(widget, QtWidgets.QTableView):
-                widget.setRowCount(0)
-                widget.setColumnCount(0)
+        for widget in self.context.tables.values():
+            widget.model().clear()
 
         self.IngestTreeView.reset()
 
@@ -235,7 +280,7 @@ class IngestApp(_ui.Ui_MainWindow, QtWidgets.QMainWindow):
 
         - Checks if a project and server are selected. Displays a warning if not.
         - Creates a validation progress dialog to show progress during validation.
-        - Iterates over QTableViews in the application.
+        - Iterates over the tables of the 'IngestContext'.
         - For each table, iterates over rows and columns to validate data and fill the version column.
         - Updates the UI and triggers validation progress.
 
@@ -253,10 +298,9 @@ class IngestApp(_ui.Ui_MainWindow, QtWidgets.QMainWindow):
             return
 
         validate_dict = {}
-        published_files = read.PublishedFiles(
-            prj_name=self.project_name
-        ).published_files
-        widgets = app.allWidgets()
+        # (widget, row, column, destination path) of the rows waiting for a version
+        version_rows = []
+        widgets = list(self.context.tables.values())
 
         # Create a validation progress dialog
         progress_dialog = QtWidgets.QProgressDialog(self)
@@ -272,92 +316,64 @@ class IngestApp(_ui.Ui_MainWindow, QtWidgets.QMainWindow):
         progress_dialog.setValue(0)
 
         for idx, widget in enumerate(widgets):
-            if isinstance(widget, QtWidgets.QTableView):
-                table_name = widget.objectName()
-                for row_index in range(widget.rowCount()):
-                    row_data = []
-                    item = widget.item(row_index, 0)
-                    if item.checkState():
-                        path_dict = dict()
-                        flag = True
-                        version_index = widget.columnCount() - 2
-                        for column_index in range(1, widget.columnCount()):
-                            item = widget.item(row_index, column_index)
-                            header = widget.horizontalHeaderItem(column_index)
-                            path_dict["server"] = self.server_comboBox.currentText()
-                            path_dict["Show"] = self.show_comboBox.currentText().upper()
-
-                            if item is not None:
-                                if item.text() == "":
-                                    widget.itemChanged.disconnect(
-                                        widget.handleItemChanged
-                                    )
-                                    if table_name in validate_dict:
-                                        validate_dict[table_name].append(
-                                            "Row {} {} column".format(
-                                                row_index + 1, header.text()
-                                            )
-                                        )
-
-                                    else:
-                                        validate_dict[table_name] = [
-                                            "Row {} {} column".format(
-                                                row_index + 1,
-                                                header.text(),
-                                            )
-                                        ]
-
-                                    item.setData(
-                                        QtCore.Qt.UserRole, QtGui.QColor("red")
-                                        
-                                    )
-                                    print('project name and sequence not present')
-
-                                    flag = False
-                                    widget.itemChanged.connect(widget.handleItemChanged)
-                                    continue
-                                row_data.append(item.text())
-                                path_dict[header.text()] = item.text()
-
-                            else:
-                                combo_box = widget.cellWidget(row_index, column_index)
-                                row_data.append(combo_box.currentText())
-                                path_dict[header.text()] = combo_box.currentText()
-
-                        if flag:
-                            path_dict["Extension"] = os.path.splitext(
-                                path_dict["Preview"]
-                            )[-1]
-
-                            file_path = (
-                                yaml_data["Table"][table_name]["path"]
-                                .split("{Version}")[0]
-                                .format(**path_dict)
-                            )
-
-                            pattern = r"[\\/]v(\d+)"
-                            filtered_list = [
-                                int(match.group(1))
-                                for match in (
-                                    re.search(pattern, d["sg_filepath"])
-                                    for d in published_files
-                                    if d["sg_filepath"]
-                                    and file_path in d["sg_filepath"]
-                                )
-                                if match
-                            ] or [0]
-
-                            version = "v" + str(max(filtered_list) + 1).zfill(3)
-                            widget.setItem(
-                                row_index,
-                                version_index,
-                                QtWidgets.QTableWidgetItem(version),
-                            )
-                progress_dialog.setValue(idx + 1)
-                QtWidgets.QApplication.processEvents()
-
-                # Simulating work for the current table (remove this in your actual code)
-                # time.sleep(1)
+            table_name = widget.objectName()
+            model = widget.model()
+            version_index = model.columnCount() - 2
+            for row_index in model.checked_rows():
+                path_dict = dict()
+                flag = True
+                path_dict["server"] = server_name
+                path_dict["Show"] = project_name.upper()
+                for column_index in range(1, model.columnCount()):
+                    header = model.headers[column_index]
+                    text = model.cell_text(row_index, column_index)
+
+                    if text == "" and not model.is_choice_column(column_index):
+                        validate_dict.setdefault(table_name, []).append(
+                            "Row {} {} column".format(row_index + 1, header)
+                        )
+                        model.set_cell_color(row_index, column_index, "red")
+                        print('project name and sequence not present')
+
+                        flag = False
+                        continue
+                    path_dict[header] = text
+
+                if flag:
+                    path_dict["Extension"] = os.path.splitext(
+                        path_dict["Preview"]
+                    )[-1]
+
+                    file_path = (
+                        get_yaml_data()["Table"][table_name]["path"]
+                        .split("{Version}")[0]
+                        .format(**path_dict)
+                    )
+
+                    version_rows.append(
+                        (widget, row_index, version_index, file_path)
+                    )
+            progress_dialog.setValue(idx + 1)
+            QtWidgets.QApplication.processEvents()
+
+            # Simulating work for the current table (remove this in your actual code)
+            # time.sleep(1)
+
+        # Only the published files under the checked rows' paths are fetched
+        try:
+            published_versions = PublishedVersionQuery(project_name).resolve(
+                file_path for _, _, _, file_path in version_rows
+            )
+        except Exception as e:
+            # The version column is left as it is, Validate can be run again
+            progress_dialog.close()
+            self.DialogBox("Warning", f"Published versions could not be read from ShotGrid:\n{e}")
+            return validate_dict or None
+
+        for widget, row_index, version_index, file_path in version_rows:
+            version = published_versions.next_version(file_path)
+            # Updates the preview path of the row through handleItemChanged
+            widget.model().set_cell_text(row_index, version_index, version)
         progress_dialog.close()
 
         if validate_dict:
@@ -393,189 +409,162 @@ class IngestApp(_ui.Ui_MainWindow, QtWidgets.QMainWindow):
         Generate a log for published files.
         Validate the published file once again and publish the files in Shotgun as well as copy to the file server.
 
-        - Retrieves project details and initializes lists for published and unpublished files.
-        - Creates a progress dialog to show progress during the publish process.
-        - Iterates over QTableViews in the application.
-        - For each table, iterates over rows and columns to validate data and publish files.
-        - Updates the UI and triggers publish progress.
-        - Logs information about published and unpublished files.
-        - Displays a success message in a dialog box.
+        - Iterates over the tables of the 'IngestContext' and takes a snapshot of the checked, valid rows.
+        - Marks rows with missing data red straight away.
+        - Starts a PublishWorker on the global QThreadPool, which provisions the shots, copies the
+          frames, publishes the files in Shotgun and submits the Deadline transfers off the GUI thread.
+        - Shows a non-modal progress dialog whose Cancel button stops the worker.
+        - Locks the tables until the worker is done, its results are keyed by row index.
+        - Row colours, progress and the final log are updated from the worker signals.
         """
-        logger = get_logger(self.project_name, self.server_name)
-        project_id = read._get_details_one(
-            "Project", [["name", "is", self.show_comboBox.currentText()]], ["id"]
-        )["id"]
-        widgets = app.allWidgets()
-        PublishedFiles = []
-        UnPublishedFiles = []
-
-        # Create a publish progress dialog
-        progress_dialog = QtWidgets.QProgressDialog(self)
-        progress_dialog.setWindowTitle("Publish Progress")
-        progress_dialog.setLabelText("Publish Table Data...")
-        progress_dialog.setModal(True)
-        progress_dialog.setAutoClose(True)
-        progress_dialog.setAutoReset(True)
-        progress_dialog.setMinimumDuration(0)
+        if self.publish_worker is not None:
+            self.DialogBox("Warning", "A publish is already running")
+            return
 
-        # Set the maximum value based on your task
-        progress_dialog.setMaximum(len(widgets))
-        progress_dialog.setValue(0)
+        # Only rescans the source tree if it changed since it was screened
+        file_screen = get_file_screen()
+        file_screen.sequence_index.ensure(self.context.source_path)
+
+        publish_rows = []
+        self.publish_tables = dict(self.context.tables)
+        for widget in self.publish_tables.values():
+            model = widget.model()
+            for row_index in model.checked_rows():
+                flag = True
+                make_shot_name = None
+                make_sequence_name = None
+                for column_index in range(1, model.columnCount()):
+                    if model.is_choice_column(column_index):
+                        continue
+                    header = model.headers[column_index]
+                    text = model.cell_text(row_index, column_index)
+                    if header == "Shot":
+                        make_shot_name = text
+                    if header == "Sequence":
+                        make_sequence_name = text
+                    if text == "" or "None" in text:
+                        flag = False
+                        break
+
+                if flag:
+                    file_path = model.cell_text(row_index, model.columnCount() - 1)
+
+                    # O(1) lookup in the index built while screening
+                    seq = file_screen.sequence_index.get(
+                        os.path.basename(file_path)
+                    )
+                    if seq is not None:
+                        publish_rows.append(
+                            {
+                                "key": (widget.objectName(), row_index),
+                                "file_path": str(file_path),
+                                "sequence": make_sequence_name,
+                                "shot": make_shot_name,
+                                "seq": seq,
+                            }
+                        )
+
+                else:
+                    model.set_cell_color(row_index, column_index, "red")
+
+        # Create a publish progress dialog, it stays non-modal so the tables keep repainting
+        self.publish_progress_dialog = QtWidgets.QProgressDialog(self)
+        self.publish_progress_dialog.setWindowTitle("Publish Progress")
+        self.publish_progress_dialog.setLabelText("Publish Table Data...")
+        self.publish_progress_dialog.setAutoClose(False)
+        self.publish_progress_dialog.setAutoReset(False)
+        self.publish_progress_dialog.setMinimumDuration(0)
+        self.publish_progress_dialog.setMaximum(max(len(publish_rows), 1))
+        self.publish_progress_dialog.setValue(0)
+
+        self.publish_worker = PublishWorker(
+            publish_rows,
+            self.project_name,
+            self.server_name,
+            self.show_comboBox.currentText(),
+            get_yaml_data().get("Publish", {}),
+            self.shot_provisioner,
+            self.deadline_monitor,
+        )
+        self.publish_worker.signals.row_status.connect(self.SetPublishRowStatus)
+        self.publish_worker.signals.progress.connect(self.SetPublishProgress)
+        self.publish_worker.signals.finished.connect(self.PublishFinished)
+        self.publish_progress_dialog.canceled.connect(self.publish_worker.cancel)
+
+        self.ingest_publish_button.setEnabled(False)
+        self.ingest_validate_button.setEnabled(False)
+        self.ingest_cancel_button.setEnabled(False)
+        for widget in self.publish_tables.values():
+            widget.set_locked(True)
+        QtCore.QThreadPool.globalInstance().start(self.publish_worker)
+
+    def SetPublishRowStatus(self, row_key, color):
+        """
+        Colour the preview cell of a published row.
 
-        for idx, widget in enumerate(widgets):
-            if isinstance(widget, QtWidgets.QTableView):
-                for row_index in range(widget.rowCount()):
-                    item = widget.item(row_index, 0)
-                    if item.checkState():
-                        flag = True
-                        make_shot_name = None
-                        make_sequence_name = None
-                        for column_index in range(1, widget.columnCount()):
-                            item = widget.item(row_index, column_index)
-                            header = widget.horizontalHeaderItem(column_index)
-                            if item is not None:
-                                if header.text() == "Shot":
-                                    make_shot_name = item.text()
-                                if header.text() == "Sequence":
-                                    make_sequence_name = item.text()
-                                if item.text() == "" or "None" in item.text():
-                                    flag = False
-                                    break
-
-                        if flag:
-                            widget.itemChanged.disconnect(widget.handleItemChanged)
-
-                            file_path = widget.item(row_index, column_index).text()
-                            file_name = os.path.basename(file_path)
-                            dst_path = os.path.dirname(file_path)
-
-                            for root, dirs, files in os.walk(self.source_path):
-                                file_sequence = fileseq.findSequencesOnDisk(root)
-                                for seq in file_sequence:
-                                    seq_file_name = (
-                                        seq.basename()
-                                        + seq.frameRange()
-                                        + seq.extension()
-                                    )
-                                    published = None
-                                    if seq_file_name == file_name:
-                                        src_path = seq
-
-                                        publish_data = {
-                                            "project": {
-                                                "type": "Project",
-                                                "id": project_id,
-                                            },
-                                            "code": str(file_name),
-                                            "sg_filepath": str(file_path),
-                                            "sg_source_path": str(src_path),
-                                        }
-                                        if (
-                                            
-                                            self.project_name
-                                            and self.server_name
-                                            and make_sequence_name
-                                            and make_shot_name
-                                        ):
-                                            shots.create(
-                                                self.server_name,
-                                                self.project_name,
-                                                make_sequence_name,
-                                                make_shot_name,
-                                                None,
-                                                None,
-                                            )
-
-                                        if len(seq) > 1:
-                                            try:
-                                                copy_file_seq(src_path, dst_path)
-                                                published = create._create_entry(
-                                                    "PublishedFile", publish_data
-                                                )
-                                                deadline_ingest(publish_data,self.server_name)
-                                                item.setData(
-                                                    QtCore.Qt.UserRole,
-                                                    QtGui.QColor("green"),
-                                                )
-                                            except FileExistsError:
-                                                print(
-                                                    "File Already exists and cannot be replaced {}".format(
-                                                        file_path
-                                                    )
-                                                )
-                                                item.setData(
-                                                    QtCore.Qt.UserRole,
-                                                    QtGui.QColor("red"),
-                                                )
-                                            except Exception as e:
-                                                print(e)
-                                                item.setData(
-                                                    QtCore.Qt.UserRole,
-                                                    QtGui.QColor("red"),
-                                                )
-                                        else:
-                                            try:
-                                                copy_file(
-                                                    os.path.join(
-                                                        os.path.dirname(str(src_path)),
-                                                        seq.basename()
-                                                        + seq.frameRange()
-                                                        + seq.extension(),
-                                                    ),
-                                                    dst_path,
-                                                )
-                                                published = create._create_entry(
-                                                    "PublishedFile", publish_data
-                                                )
-                                                # src_for_deadline = publish_data['sg_filepath']
-                                                # print ("***************src_for_deadline",src_for_deadline)
-                                                
-                                                deadline_ingest(publish_data,self.server_name)
-                                                item.setData(
-                                                    QtCore.Qt.UserRole,
-                                                    QtGui.QColor("green"),
-                                                )
-                                            
-                                            except FileExistsError:
-                                                print(
-                                                    "File Already exists and cannot be replaced {}".format(
-                                                        dst_path
-                                                    )
-                                                )
-                                                item.setData(
-                                                    QtCore.Qt.UserRole,
-                                                    QtGui.QColor("red"),
-                                                )
-                                            except Exception as e:
-                                                print(e)
-                                                item.setData(
-                                                    QtCore.Qt.UserRole,
-                                                    QtGui.QColor("red"),
-                                                )
-
-                                        if published:
-                                            PublishedFiles.append(str(file_path) + "\n")
-                                        else:
-                                            UnPublishedFiles.append(
-                                                str(file_path) + "\n"
-                                            )
-
-                            widget.itemChanged.connect(widget.handleItemChanged)
-
-                        else:
-                            widget.itemChanged.disconnect(widget.handleItemChanged)
-                            item.setData(QtCore.Qt.UserRole, QtGui.QColor("red"))
-                            widget.itemChanged.connect(widget.handleItemChanged)
-                progress_dialog.setValue(idx + 1)
-                QtWidgets.QApplication.processEvents()
-
-                # Simulating work for the current table (remove this in your actual code)
-                # time.sleep(1)
-
-        # Close progress dialog
-        progress_dialog.close()
+        Args:
+        - row_key (tuple): The (table name, row index) of the row.
+        - color (str): The status colour name.
+        """
+        table_name, row_index = row_key
+        widget = self.publish_tables.get(table_name)
+        if widget is None or row_index >= widget.model().rowCount():
+            return
+
+        model = widget.model()
+        model.set_cell_color(row_index, model.columnCount() - 1, color)
+
+    def SetPublishProgress(self, value, maximum, label):
+        """
+        Update the publish progress dialog.
+
+        Args:
+        - value (int): The current progress value.
+        - maximum (int): The progress maximum, 0 shows a busy indicator.
+        - label (str): The dialog label text.
+        """
+        self.publish_progress_dialog.setLabelText(label)
+        self.publish_progress_dialog.setMaximum(maximum)
+        self.publish_progress_dialog.setValue(value)
+
+    def SetTransferStatus(self, job_id, job_status, progress_percent):
+        """
+        Show the state of a Deadline transfer and log the finished ones.
+
+        Args:
+        - job_id (str): The Deadline job id.
+        - job_status (str): The lower case job status, e.g. "active" or "completed".
+        - progress_percent (int): The job progress, None if Deadline did not report it.
+        """
+        if progress_percent is not None:
+            message = "Transfer {} {} {}%".format(job_id, job_status, progress_percent)
+        else:
+            message = "Transfer {} {}".format(job_id, job_status)
+        self.statusBar().showMessage(message)
+
+        if job_status in FINISHED_STATUSES:
+            logger = get_logger(self.project_name, self.server_name)
+            logger.info(message)
+
+    def PublishFinished(self, PublishedFiles, UnPublishedFiles):
+        """
+        Log the published and unpublished files once the publish worker is done.
+
+        Args:
+        - PublishedFiles (list): The published file paths.
+        - UnPublishedFiles (list): The file paths that failed or were cancelled.
+        """
+        cancelled = self.publish_worker.is_cancelled()
+        self.publish_worker = None
+        self.publish_progress_dialog.close()
+        self.ingest_publish_button.setEnabled(True)
+        self.ingest_validate_button.setEnabled(True)
+        self.ingest_cancel_button.setEnabled(True)
+        for widget in self.publish_tables.values():
+            widget.set_locked(False)
 
         # Log information about published and unpublished files
+        logger = get_logger(self.project_name, self.server_name)
         logger.info(
             "Published Files :\n" + ("\n".join(PublishedFiles) or "No published files")
         )
@@ -583,7 +572,10 @@ class IngestApp(_ui.Ui_MainWindow, QtWidgets.QMainWindow):
             logger.info("Unpublished Files :\n" + "\n".join(UnPublishedFiles))
 
         # Display a success message in a dialog box
-        self.DialogBox("Success", "Ingestion Completed")
+        if cancelled:
+            self.DialogBox("Warning", "Ingestion Cancelled")
+        else:
+            self.DialogBox("Success", "Ingestion Completed")
 
     def DialogBox(self, window_title, message):
         """
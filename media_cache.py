@@ -0,0 +1,196 @@
+"""
+media_cache.py:
+
+This module defines the MediaCache class, a small SQLite store that
+ remembers the probed resolution of every screened sequence between
+   sessions.
+
+Classes:
+    MediaCache:
+        A persistent resolution cache keyed by directory, sequence
+        pattern, file size and mtime, with least recently used eviction.
+
+Usage:
+    cache = MediaCache()
+    res = cache.get(directory, pattern, size, mtime)
+    if res is None:
+        res = probe(...)
+        cache.put(directory, pattern, size, mtime, res)
+    cache.flush()
+"""
+
+
+import os
+import sqlite3
+import threading
+import time
+
+
+DEFAULT_CACHE_PATH = os.path.join(
+    os.path.expanduser("~"), ".cache", "ingest_tool", "media_cache.sqlite"
+)
+DEFAULT_CACHE_SIZE = 50000
+
+# Writes are committed in batches, one commit per lookup would fsync thousands of times
+FLUSH_INTERVAL = 500
+
+
+class MediaCache:
+    """
+    Persistent resolution cache for screened sequences.
+
+    An entry is only returned while the size and mtime of the sampled frame
+    are unchanged, so re-screening an untouched delivery never probes media
+    again. The cache is safe to share between screening threads, and a
+    broken or unwritable cache file only disables it.
+
+    Attributes:
+        path (str): The SQLite database path.
+        max_entries (int): The number of entries kept before the least recently used are evicted.
+    """
+
+    def __init__(self, path=None, max_entries=None):
+        """
+        Initialize the MediaCache object.
+
+        Args:
+            path (str): The SQLite database path, defaults to DEFAULT_CACHE_PATH.
+            max_entries (int): The maximum number of entries, defaults to DEFAULT_CACHE_SIZE.
+        """
+        self.path = path or DEFAULT_CACHE_PATH
+        self.max_entries = max_entries or DEFAULT_CACHE_SIZE
+        self._lock = threading.Lock()
+        self._connection = None
+        self._pending = dict()
+        self._touched = set()
+
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            # Screening threads share the connection behind the lock
+            self._connection = sqlite3.connect(
+                self.path, timeout=5, check_same_thread=False
+            )
+            with self._connection:
+                self._connection.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS media (
+                        directory TEXT NOT NULL,
+                        pattern TEXT NOT NULL,
+                        size INTEGER NOT NULL,
+                        mtime INTEGER NOT NULL,
+                        resolution TEXT NOT NULL,
+                        last_access REAL NOT NULL,
+                        PRIMARY KEY (directory, pattern)
+                    )
+                    """
+                )
+                self._connection.execute(
+                    "CREATE INDEX IF NOT EXISTS media_last_access ON media (last_access)"
+                )
+                self._evict()
+        except (OSError, sqlite3.Error) as e:
+            print(f"Error: Media cache disabled - {e} for file: {self.path}")
+            self._connection = None
+
+    def get(self, directory, pattern, size, mtime):
+        """
+        Look up the cached resolution of a sequence.
+
+        Args:
+            directory (str): The directory of the sequence.
+            pattern (str): The sequence pattern, e.g. "plate.1001-1100#.exr".
+            size (int): The size in bytes of the sampled frame.
+            mtime (int): The st_mtime_ns of the sampled frame.
+
+        Returns:
+            str: The cached resolution, or None on a miss or a changed file.
+        """
+        if self._connection is None:
+            return None
+
+        with self._lock:
+            pending = self._pending.get((directory, pattern))
+            if pending is not None:
+                return pending[2] if pending[:2] == (size, mtime) else None
+
+            try:
+                row = self._connection.execute(
+                    "SELECT resolution FROM media WHERE directory = ? AND pattern = ?"
+                    " AND size = ? AND mtime = ?",
+                    (directory, pattern, size, mtime),
+                ).fetchone()
+            except sqlite3.Error as e:
+                print(f"Error: Media cache lookup failed - {e}")
+                return None
+
+            if row is None:
+                return None
+            self._touched.add((directory, pattern))
+            self._flush_if_full()
+            return row[0]
+
+    def put(self, directory, pattern, size, mtime, resolution):
+        """
+        Store the resolution of a sequence.
+
+        Writes are kept in memory and committed in batches, call flush() once
+        screening is done.
+
+        Args:
+            directory (str): The directory of the sequence.
+            pattern (str): The sequence pattern.
+            size (int): The size in bytes of the sampled frame.
+            mtime (int): The st_mtime_ns of the sampled frame.
+            resolution (str): The resolution in the format "widthxheight".
+        """
+        if self._connection is None:
+            return
+
+        with self._lock:
+            self._pending[(directory, pattern)] = (size, mtime, resolution)
+            self._flush_if_full()
+
+    def flush(self):
+        """
+        Commit pending entries and access times, then evict the least recently used entries.
+        """
+        if self._connection is None:
+            return
+
+        with self._lock:
+            self._flush()
+
+    def _flush_if_full(self):
+        if len(self._pending) + len(self._touched) >= FLUSH_INTERVAL:
+            self._flush()
+
+    def _flush(self):
+        now = time.time()
+        try:
+            with self._connection:
+                self._connection.executemany(
+                    "INSERT OR REPLACE INTO media VALUES (?, ?, ?, ?, ?, ?)",
+                    (
+                        (directory, pattern, size, mtime, resolution, now)
+                        for (directory, pattern), (size, mtime, resolution) in self._pending.items()
+                    ),
+                )
+                self._connection.executemany(
+                    "UPDATE media SET last_access = ? WHERE directory = ? AND pattern = ?",
+                    ((now, directory, pattern) for directory, pattern in self._touched),
+                )
+                self._evict()
+        except sqlite3.Error as e:
+            print(f"Error: Media cache update failed - {e}")
+        self._pending.clear()
+        self._touched.clear()
+
+    def _evict(self):
+        count = self._connection.execute("SELECT COUNT(*) FROM media").fetchone()[0]
+        if count > self.max_entries:
+            # Evict down to 90% so a full cache does not evict on every flush
+            self._connection.execute(
+                "DELETE FROM media WHERE rowid IN ("
+                "SELECT rowid FROM media ORDER BY last_access LIMIT ?)",
+                (count - int(self.max_entries * 0.9),),
+            )
@@ -0,0 +1,230 @@
+"""
+media_header.py:
+
+This module reads the resolution of an image straight from its file
+ header, so screening never has to decode a whole frame.
+
+Functions:
+    read_image_resolution(path):
+        Returns (width, height) for EXR, DPX, TIFF, PNG and JPEG files,
+        or None when the format is not handled or not recognised.
+
+    read_exr_attributes(path):
+        Returns the raw header attributes of an OpenEXR file.
+
+Usage:
+    resolution = read_image_resolution("plate.1001.exr")
+    if resolution:
+        print("{}x{}".format(*resolution))
+"""
+
+
+import os
+import struct
+
+
+EXR_MAGIC = b"\x76\x2f\x31\x01"
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+# Headers bigger than this are not trusted, a real EXR header is a few KB
+MAX_EXR_HEADER_SIZE = 1024 * 1024
+
+# JPEG start of frame markers, all of C0-CF except DHT, JPG and DAC
+JPEG_SOF_MARKERS = set(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+# DPX fields that mark an undefined value
+DPX_UNDEFINED = (0, 0xFFFFFFFF)
+
+
+def read_image_resolution(path):
+    """
+    Read the resolution of an image from its header.
+
+    Args:
+        path (str): The path of the image file.
+
+    Returns:
+        tuple: (width, height), or None if the header could not be understood.
+
+    Raises:
+        OSError: If the file cannot be opened or read.
+        struct.error: If the header is truncated.
+    """
+    extension = os.path.splitext(path)[-1][1:].lower()
+    reader = HEADER_READERS.get(extension)
+    if reader is None:
+        return None
+
+    with open(path, "rb") as file:
+        return reader(file)
+
+
+def read_exr_attributes(path):
+    """
+    Read the attributes of the first header of an OpenEXR file.
+
+    Args:
+        path (str): The path of the EXR file.
+
+    Returns:
+        dict: Attribute name to (attribute type, raw value bytes), or None if
+            the file is not an EXR.
+    """
+    with open(path, "rb") as file:
+        return _read_exr_header(file)
+
+
+def _read_null_terminated(file):
+    data = bytearray()
+    while True:
+        char = file.read(1)
+        if not char:
+            raise struct.error("unexpected end of header")
+        if char == b"\x00":
+            return data.decode("ascii", "replace")
+        data += char
+
+
+def _read_exr_header(file):
+    if file.read(4) != EXR_MAGIC:
+        return None
+    file.read(4)  # version and flags
+
+    attributes = dict()
+    header_size = 8
+    while header_size < MAX_EXR_HEADER_SIZE:
+        name = _read_null_terminated(file)
+        if not name:
+            # An empty name ends the header
+            return attributes
+        attribute_type = _read_null_terminated(file)
+        size = struct.unpack("<i", file.read(4))[0]
+        attributes[name] = (attribute_type, file.read(size))
+        header_size += len(name) + len(attribute_type) + 6 + size
+
+    raise struct.error("header is larger than {} bytes".format(MAX_EXR_HEADER_SIZE))
+
+
+def _read_exr_resolution(file):
+    # The dataWindow is what OpenCV decoded, the displayWindow only covers
+    # files whose data window is missing
+    attributes = _read_exr_header(file)
+    if not attributes:
+        return None
+
+    for name in ("dataWindow", "displayWindow"):
+        if name in attributes and attributes[name][0] == "box2i":
+            x_min, y_min, x_max, y_max = struct.unpack("<4i", attributes[name][1][:16])
+            return x_max - x_min + 1, y_max - y_min + 1
+    return None
+
+
+def _read_dpx_resolution(file):
+    # The magic number "SDPX" is big-endian, "XPDS" is little-endian
+    magic_number = file.read(4)
+    if magic_number == b"SDPX":
+        endianness = ">"
+    elif magic_number == b"XPDS":
+        endianness = "<"
+    else:
+        return None
+
+    # The original x/y size at 1424 is what the tool always reported, the
+    # image element pixels/lines at 772 are used when it is undefined
+    file.seek(1424, 0)
+    width, height = struct.unpack(endianness + "2I", file.read(8))
+    if width in DPX_UNDEFINED or height in DPX_UNDEFINED:
+        file.seek(772, 0)
+        width, height = struct.unpack(endianness + "2I", file.read(8))
+    return width, height
+
+
+def _read_tiff_resolution(file):
+    header = file.read(8)
+    if header[:2] == b"II":
+        endianness = "<"
+    elif header[:2] == b"MM":
+        endianness = ">"
+    else:
+        return None
+
+    version = struct.unpack(endianness + "H", header[2:4])[0]
+    if version == 42:
+        ifd_offset = struct.unpack(endianness + "I", header[4:8])[0]
+        count_format, entry_format = "H", "HHI4s"
+    elif version == 43:
+        # BigTIFF
+        ifd_offset = struct.unpack(endianness + "Q", file.read(8))[0]
+        count_format, entry_format = "Q", "HHQ8s"
+    else:
+        return None
+
+    file.seek(ifd_offset, 0)
+    count_size = struct.calcsize(endianness + count_format)
+    entry_size = struct.calcsize(endianness + entry_format)
+    entry_count = struct.unpack(endianness + count_format, file.read(count_size))[0]
+    entries = file.read(entry_count * entry_size)
+
+    value_formats = {3: "H", 4: "I", 16: "Q"}
+    size = dict()
+    for index in range(entry_count):
+        tag, field_type, _, value = struct.unpack_from(
+            endianness + entry_format, entries, index * entry_size
+        )
+        # 256 is ImageWidth and 257 is ImageLength
+        if tag in (256, 257) and field_type in value_formats:
+            value_format = endianness + value_formats[field_type]
+            size[tag] = struct.unpack_from(value_format, value)[0]
+
+    if 256 in size and 257 in size:
+        return size[256], size[257]
+    return None
+
+
+def _read_png_resolution(file):
+    header = file.read(24)
+    if header[:8] != PNG_SIGNATURE or header[12:16] != b"IHDR":
+        return None
+    return struct.unpack(">2I", header[16:24])
+
+
+def _read_jpeg_resolution(file):
+    if file.read(2) != b"\xff\xd8":
+        return None
+
+    while True:
+        byte = file.read(1)
+        if not byte:
+            return None
+        if byte != b"\xff":
+            continue
+
+        marker = file.read(1)
+        while marker == b"\xff":
+            marker = file.read(1)
+        if not marker:
+            return None
+        marker = marker[0]
+
+        # Markers without a length field
+        if marker == 0x01 or 0xD0 <= marker <= 0xD9:
+            continue
+
+        length = struct.unpack(">H", file.read(2))[0]
+        if marker in JPEG_SOF_MARKERS:
+            height, width = struct.unpack(">xHH", file.read(5))
+            return width, height
+
+        # Skip the segment without reading it, EXIF thumbnails can be large
+        file.seek(length - 2, 1)
+
+
+HEADER_READERS = {
+    "exr": _read_exr_resolution,
+    "dpx": _read_dpx_resolution,
+    "tif": _read_tiff_resolution,
+    "tiff": _read_tiff_resolution,
+    "png": _read_png_resolution,
+    "jpg": _read_jpeg_resolution,
+    "jpeg": _read_jpeg_resolution,
+}
@@ -0,0 +1,82 @@
+"""
+publish_batch.py:
+
+This module defines the PublishedFileBatcher class, which creates the
+ PublishedFile entities of a publish in chunks, so the publish progress
+   is reported per chunk and one failed item never stops the others.
+
+Classes:
+    PublishedFileBatcher:
+        Creates entities chunk by chunk and collects the error of every
+        failed item.
+
+Usage:
+    batcher = PublishedFileBatcher(chunk_size=100)
+    for entity, error in batcher.create("PublishedFile", publish_data_list):
+        ...
+"""
+
+
+DEFAULT_CHUNK_SIZE = 100
+
+
+def _create_entry(entity_type, data):
+    from sg_utils import create
+
+    return create._create_entry(entity_type, data)
+
+
+class PublishedFileBatcher:
+    """
+    Creates ShotGrid entities chunk by chunk.
+
+    sg_utils only creates one entity per request, so every item is still
+    its own request; the chunks set how often progress is reported. The
+    error of a failed item is kept with its result and the other items are
+    still created. Results always come back in the order of the input.
+
+    Attributes:
+        chunk_size (int): The number of entities between progress reports.
+        create_entry (callable): Called as create_entry(entity_type, data) for every item.
+    """
+
+    def __init__(self, chunk_size=None, create_entry=None):
+        """
+        Initialize the PublishedFileBatcher object.
+
+        Args:
+            chunk_size (int): The number of entities between progress reports.
+            create_entry (callable): The single create function, defaults to create._create_entry.
+        """
+        self.chunk_size = chunk_size or DEFAULT_CHUNK_SIZE
+        self.create_entry = create_entry or _create_entry
+
+    def create(self, entity_type, data_list, on_chunk=None):
+        """
+        Create one entity per data dict.
+
+        Args:
+            entity_type (str): The ShotGrid entity type, e.g. "PublishedFile".
+            data_list (list): The data dicts of the entities.
+            on_chunk (callable): Called with the number of finished items after every chunk.
+
+        Returns:
+            list: (entity, error) tuples in the order of data_list, entity is the
+                created entity dict or None and error the exception of a failed item.
+        """
+        results = []
+        for start in range(0, len(data_list), self.chunk_size):
+            chunk = data_list[start : start + self.chunk_size]
+            results.extend(self._create_chunk(entity_type, chunk))
+            if on_chunk:
+                on_chunk(len(results))
+        return results
+
+    def _create_chunk(self, entity_type, chunk):
+        results = []
+        for data in chunk:
+            try:
+                results.append((self.create_entry(entity_type, data), None))
+            except Exception as e:
+                results.append((None, e))
+        return results
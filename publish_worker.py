@@ -0,0 +1,318 @@
+"""
+publish_worker.py:
+
+This module defines the PublishWorker class, which runs the copy,
+ ShotGrid publish and Deadline submission of an ingest off the Qt
+   main thread.
+
+Classes:
+    PublishSignals:
+        The Qt signals a PublishWorker reports through.
+
+    PublishWorker:
+        A QRunnable publishing a snapshot of the checked table rows.
+
+Usage:
+    worker = PublishWorker(rows, project_name, server_name, show_name, publish_config)
+    worker.signals.row_status.connect(on_row_status)
+    worker.signals.finished.connect(on_finished)
+    QtCore.QThreadPool.globalInstance().start(worker)
+"""
+
+
+import os
+import threading
+
+from PySide2 import QtCore
+
+from sg_cache import project_id
+from copy_engine import CopyScheduler
+from publish_batch import PublishedFileBatcher
+from shot_provision import ShotProvisioner
+from deadline_integrate import batch_transfer_available, deadline_ingest, deadline_ingest_batch
+
+
+class PublishSignals(QtCore.QObject):
+    """
+    Signals emitted by a PublishWorker, delivered on the thread of the connected receiver.
+
+    row_status (object, str): The row key and its status colour name ("green" or "red").
+    progress (int, int, str): The progress value, maximum and label text.
+    finished (list, list): The published and the unpublished file paths.
+    """
+
+    row_status = QtCore.Signal(object, str)
+    progress = QtCore.Signal(int, int, str)
+    finished = QtCore.Signal(list, list)
+
+
+class PublishWorker(QtCore.QRunnable):
+    """
+    Publishes a snapshot of table rows on a QThreadPool thread.
+
+    The rows are plain dicts taken on the main thread, so the worker never
+    touches a widget. Every row reports its result through
+    signals.row_status and the whole run can be cancelled.
+
+    Attributes:
+        rows (list): Row dicts with "key", "file_path", "sequence", "shot" and "seq" keys.
+        project_name (str): The upper case project name used for the shot folders.
+        server_name (str): The file server the files are published to.
+        show_name (str): The ShotGrid project name.
+        publish_config (dict): The "Publish" section of the YAML data.
+        shot_provisioner (ShotProvisioner): Creates the shots of the rows.
+        deadline_monitor (DeadlineJobMonitor): Follows the transfer jobs, the publish never waits for them.
+        signals (PublishSignals): The signals progress and results are reported through.
+    """
+
+    def __init__(
+        self,
+        rows,
+        project_name,
+        server_name,
+        show_name,
+        publish_config=None,
+        shot_provisioner=None,
+        deadline_monitor=None,
+    ):
+        """
+        Initialize the PublishWorker object.
+
+        Args:
+            rows (list): The row snapshot to publish.
+            project_name (str): The upper case project name.
+            server_name (str): The file server name.
+            show_name (str): The ShotGrid project name.
+            publish_config (dict): The "Publish" section of the YAML data.
+            shot_provisioner (ShotProvisioner): Creates the shots, share one between
+                publishes so shots are created once per session.
+            deadline_monitor (DeadlineJobMonitor): Follows the submitted transfer jobs.
+        """
+        super(PublishWorker, self).__init__()
+        self.rows = rows
+        self.project_name = project_name
+        self.server_name = server_name
+        self.show_name = show_name
+        self.publish_config = publish_config or {}
+        self.shot_provisioner = shot_provisioner or ShotProvisioner(
+            max_workers=self.publish_config.get("shot_workers")
+        )
+        self.deadline_monitor = deadline_monitor
+        self.signals = PublishSignals()
+        self._cancelled = threading.Event()
+        self._copy_scheduler = None
+
+    def cancel(self):
+        """
+        Stop the publish: pending frame copies are skipped and no further row is published.
+        """
+        self._cancelled.set()
+        if self._copy_scheduler is not None:
+            self._copy_scheduler.cancel()
+
+    def is_cancelled(self):
+        """
+        Check whether the publish was cancelled.
+
+        Returns:
+            bool: True once cancel() was called.
+        """
+        return self._cancelled.is_set()
+
+    def run(self):
+        """
+        Provision the shots, copy the frames, publish the copied rows chunk
+        by chunk and submit their transfers to Deadline.
+        """
+        published_files = []
+        unpublished_files = []
+        try:
+            self.publish(published_files, unpublished_files)
+        except Exception as e:
+            print(e)
+            # Rows without a result are reported as unpublished
+            done = set(published_files) | set(unpublished_files)
+            for row in self.rows:
+                if row["file_path"] + "\n" not in done:
+                    self.signals.row_status.emit(row["key"], "red")
+                    unpublished_files.append(row["file_path"] + "\n")
+        finally:
+            self.signals.finished.emit(published_files, unpublished_files)
+
+    def submit_transfer(self, submit, *args):
+        """
+        Submit a Deadline transfer and hand its job to the monitor.
+
+        Args:
+            submit (callable): Called with args, returns the Deadline job ID.
+
+        Returns:
+            str: The row status colour, "red" if the submission failed.
+        """
+        try:
+            job_id = submit(*args)
+        except Exception as e:
+            print(e)
+            return "red"
+
+        if job_id and self.deadline_monitor is not None:
+            self.deadline_monitor.watch(job_id)
+        return "green"
+
+    def submit_transfer_batch(self, published_rows):
+        """
+        Submit the transfers of all published rows as one Deadline job with a task per chunk.
+
+        Args:
+            published_rows (list): (row, publish_data) tuples of the published rows.
+        """
+        if not published_rows:
+            return
+        self.signals.progress.emit(0, 0, "Submitting Transfers...")
+        errors = {}
+
+        def submit_batch(*args):
+            job_id, batch_errors = deadline_ingest_batch(*args)
+            errors.update(batch_errors)
+            return job_id
+
+        status = self.submit_transfer(
+            submit_batch,
+            [publish_data for _, publish_data in published_rows],
+            self.server_name,
+            self.publish_config.get("transfer_chunk_size"),
+        )
+        for index, (row, _) in enumerate(published_rows):
+            if index in errors:
+                # Only the rows whose transfer could not be resolved are left out of the job
+                print(errors[index])
+                self.signals.row_status.emit(row["key"], "red")
+            else:
+                self.signals.row_status.emit(row["key"], status)
+
+    def publish(self, published_files, unpublished_files):
+        """
+        The body of run(), results are appended to the given lists.
+
+        Args:
+            published_files (list): Collects the published file paths.
+            unpublished_files (list): Collects the file paths that failed or were cancelled.
+        """
+        self.signals.progress.emit(0, 0, "Preparing Publish...")
+        show_id = project_id(self.show_name)
+
+        self._copy_scheduler = CopyScheduler(
+            self.publish_config.get("copy_workers"),
+            self.publish_config.get("server_limits"),
+            self.publish_config.get("default_server_limit"),
+        )
+        if self.is_cancelled():
+            self._copy_scheduler.cancel()
+
+        # Every shot is created once, however many rows share it
+        shot_keys = dict()
+        if self.project_name and self.server_name:
+            for row in self.rows:
+                if row["sequence"] and row["shot"]:
+                    shot_keys[row["key"]] = (
+                        self.server_name,
+                        self.project_name,
+                        row["sequence"],
+                        row["shot"],
+                    )
+        self.signals.progress.emit(0, 0, "Creating Shots...")
+        shot_errors = self.shot_provisioner.provision(shot_keys.values())
+
+        copy_jobs = []
+        queued_rows = 0
+        for row in self.rows:
+            if self.is_cancelled():
+                break
+            queued_rows += 1
+            seq = row["seq"]
+            if shot_keys.get(row["key"]) in shot_errors:
+                unpublished_files.append(row["file_path"] + "\n")
+                self.signals.row_status.emit(row["key"], "red")
+                continue
+
+            dst_path = os.path.dirname(row["file_path"])
+            if len(seq) > 1:
+                copy_future = self._copy_scheduler.submit(seq, dst_path)
+            else:
+                copy_future = self._copy_scheduler.submit(
+                    os.path.join(
+                        os.path.dirname(str(seq)),
+                        seq.basename() + seq.frameRange() + seq.extension(),
+                    ),
+                    dst_path,
+                )
+            copy_jobs.append((row, dst_path, copy_future))
+
+        def report_copy_progress(progress):
+            if progress["bytes_total"]:
+                value = int(100 * progress["bytes_done"] / progress["bytes_total"])
+                self.signals.progress.emit(value, 100, "Copying Files...")
+
+        self._copy_scheduler.wait(on_progress=report_copy_progress, interval=0.5)
+        self._copy_scheduler.shutdown()
+
+        # Rows whose frames are all copied are published together
+        copied_rows = []
+        for row, dst_path, copy_future in copy_jobs:
+            if self.is_cancelled():
+                unpublished_files.append(row["file_path"] + "\n")
+                self.signals.row_status.emit(row["key"], "red")
+                continue
+            try:
+                copy_future.result()
+                copied_rows.append(row)
+                continue
+            except FileExistsError:
+                print("File Already exists and cannot be replaced {}".format(dst_path))
+            except Exception as e:
+                print(e)
+            unpublished_files.append(row["file_path"] + "\n")
+            self.signals.row_status.emit(row["key"], "red")
+
+        publish_data_list = [
+            {
+                "project": {"type": "Project", "id": show_id},
+                "code": os.path.basename(row["file_path"]),
+                "sg_filepath": row["file_path"],
+                "sg_source_path": str(row["seq"]),
+            }
+            for row in copied_rows
+        ]
+
+        def report_publish_progress(done):
+            self.signals.progress.emit(done, len(copied_rows), "Publish Table Data...")
+
+        report_publish_progress(0)
+        batcher = PublishedFileBatcher(self.publish_config.get("batch_size"))
+        results = batcher.create(
+            "PublishedFile", publish_data_list, on_chunk=report_publish_progress
+        )
+
+        published_rows = []
+        for row, publish_data, (published, error) in zip(copied_rows, publish_data_list, results):
+            if published:
+                published_files.append(row["file_path"] + "\n")
+                published_rows.append((row, publish_data))
+            else:
+                print(error)
+                unpublished_files.append(row["file_path"] + "\n")
+                self.signals.row_status.emit(row["key"], "red")
+
+        if self.publish_config.get("deadline_batch", True) and batch_transfer_available(self.server_name):
+            self.submit_transfer_batch(published_rows)
+        else:
+            for row, publish_data in published_rows:
+                status = self.submit_transfer(deadline_ingest, publish_data, self.server_name)
+                self.signals.row_status.emit(row["key"], status)
+
+        # Rows never queued because of a cancel
+        for row in self.rows[queued_rows:]:
+            unpublished_files.append(row["file_path"] + "\n")
+            self.signals.row_status.emit(row["key"], "red")
+
+        self.signals.progress.emit(len(copied_rows), len(copied_rows), "Publish Table Data...")
@@ -2,6 +2,37 @@
 import sys
 import subprocess
 import os
+import json
+import argparse
+import hashlib
+import heapq
+import re
+import tempfile
+import zlib
+
+
+RSYNC_OPTIONS = ["-av", "-e", "ssh"]
+
+# "zlib" is the plain -z every transfer used before, "auto" picks one per sequence
+COMPRESSION_MODES = ("auto", "none", "zlib", "zstd")
+DEFAULT_COMPRESSION = "zlib"
+# zstd needs rsync 3.2 on both ends
+COMPRESSION_OPTIONS = {"none": [], "zlib": ["-z"], "zstd": ["-z", "--compress-choice=zstd"]}
+# Frames of these formats are compressed already, -z only burns transfer blade CPU on them
+COMPRESSED_EXTENSIONS = (".mov", ".mp4", ".mxf", ".jpg", ".jpeg", ".png", ".zip", ".gz")
+# Formats whose compression depends on how they were written are sampled: the start of
+# the first frames is compressed, and a saving below this sends the sequence uncompressed
+SAMPLE_FRAMES = 3
+SAMPLE_SIZE = 256 * 1024
+MIN_COMPRESSION_SAVING = 0.1
+
+# Every file costs a round trip on top of its bytes, so tiny files still spread over the shards
+FILE_OVERHEAD_BYTES = 64 * 1024
+
+# Content manifest kept inside a transferred folder, on the source and on the destination
+MANIFEST_NAME = ".transfer_manifest.json"
+# Bytes hashed at the start, middle and end of every file
+HASH_SAMPLE_SIZE = 64 * 1024
 
 
 # Function to create a destination directory if it doesn't exist
@@ -10,9 +41,290 @@ def create_destination_directory(destination_path):
         os.makedirs(destination_path)
 
 
-source_path, destination_path = sys.argv[1].split(",")
+# Parse command-line arguments, the first form is the original "src,dst"
+def parse_args(argv):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("pair", nargs="?", help="source,destination")
+    parser.add_argument("--manifest", nargs=2, metavar=("FILE", "TASK"), help="batch job manifest and task number")
+    parser.add_argument("--streams", type=int, default=1, help="parallel rsync streams per transfer")
+    parser.add_argument("--delta", action="store_true", help="only send files that differ from the destination manifest")
+    parser.add_argument("--compression", choices=COMPRESSION_MODES, default=DEFAULT_COMPRESSION, help="rsync compression")
+    parser.add_argument("--compress-choice", choices=("zlib", "zstd"), default="zstd", help="codec \"auto\" uses on compressible frames")
+    return parser.parse_args(argv)
+
+
+# Copy one source to its destination in a single stream, returns the rsync exit code
+def transfer(source_path, destination_path, compression=DEFAULT_COMPRESSION):
+    create_destination_directory(destination_path)
+    rsync_cmd = ["rsync"] + RSYNC_OPTIONS + COMPRESSION_OPTIONS[compression] + [source_path, destination_path]
+    return subprocess.call(rsync_cmd)
+
+
+# "host:path" sources are read over ssh, a colon after the first separator is part of a name
+def is_remote(source_path):
+    return ":" in source_path.split("/", 1)[0]
+
+
+# Share of bytes zlib saves on the start of some files, about what rsync -z would save
+def sample_saving(file_paths, sample_size=SAMPLE_SIZE):
+    raw_bytes = 0
+    compressed_bytes = 0
+    for file_path in file_paths:
+        with open(file_path, "rb") as file:
+            data = file.read(sample_size)
+        raw_bytes += len(data)
+        compressed_bytes += len(zlib.compress(data, 1))
+    return 1 - compressed_bytes / raw_bytes if raw_bytes else 0
+
+
+# Pick the compression of a local source from its extensions and a sample of its first frames
+def choose_compression(source_path, codec="zstd"):
+    if is_remote(source_path) or not os.path.exists(source_path):
+        # Nothing to sample from here, the submission decides for remote sources
+        return codec
+
+    if os.path.isfile(source_path):
+        file_paths = [source_path]
+    else:
+        file_paths = []
+        for root, dirs, names in os.walk(source_path):
+            file_paths.extend(os.path.join(root, name) for name in names if name != MANIFEST_NAME)
+
+    sampled = sorted(path for path in file_paths if not path.lower().endswith(COMPRESSED_EXTENSIONS))
+    if not sampled:
+        return "none"
+    if sample_saving(sampled[:SAMPLE_FRAMES]) < MIN_COMPRESSION_SAVING:
+        return "none"
+    return codec
+
+
+# List the regular files and symlinks under a local or remote (host:path) source,
+# with -a like the transfer so symlinks are listed as links and not skipped
+def list_source_files(source_path):
+    process = subprocess.run(
+        ["rsync", "--list-only", "-a", "--no-h", "-e", "ssh", source_path],
+        stdout=subprocess.PIPE,
+        universal_newlines=True,
+    )
+    if process.returncode != 0:
+        return None
+
+    files = []
+    for line in process.stdout.splitlines():
+        # "-rw-r--r--      1048576 2024/01/01 12:00:00 plate/plate.1001.exr"
+        # "lrwxrwxrwx           21 2024/01/01 12:00:00 plate/latest.exr -> plate.1001.exr"
+        fields = line.split(None, 4)
+        if len(fields) == 5 and line[0] in "-l":
+            name = fields[4]
+            if line[0] == "l":
+                name = name.split(" -> ", 1)[0]
+            files.append((name, int(fields[1].replace(",", ""))))
+    return files
+
+
+# Split files into shards of about equal bytes, largest file first onto the lightest shard
+def balance_shards(files, streams):
+    shards = [(0, index, []) for index in range(min(streams, len(files)))]
+    heapq.heapify(shards)
+    for name, size in sorted(files, key=lambda item: -item[1]):
+        load, index, names = heapq.heappop(shards)
+        names.append(name)
+        heapq.heappush(shards, (load + size + FILE_OVERHEAD_BYTES, index, names))
+    return [names for _, _, names in sorted(shards, key=lambda shard: shard[1])]
+
+
+# Bytes reported by "rsync --stats"
+def transferred_bytes(stats_output):
+    match = re.search(r"Total transferred file size: ([\d,]+)", stats_output)
+    return int(match.group(1).replace(",", "")) if match else 0
+
+
+# Without a trailing separator rsync copies the folder itself: file names are then
+# relative to the parent folder and start with the folder name
+def split_source(source_path):
+    if source_path.endswith("/"):
+        return source_path, ""
+    return os.path.dirname(source_path) + "/", os.path.basename(source_path) + "/"
+
+
+# Copy the listed files in parallel rsync streams, returns (exit code, bytes transferred)
+def run_streams(base_path, destination_path, files, streams, compression=DEFAULT_COMPRESSION):
+    create_destination_directory(destination_path)
+    shards = balance_shards(files, streams)
+    with tempfile.TemporaryDirectory(prefix="rsync_shards_") as shard_dir:
+        processes = []
+        for index, names in enumerate(shards):
+            files_from = os.path.join(shard_dir, "shard_{}.txt".format(index))
+            with open(files_from, "w") as file:
+                file.write("\n".join(names) + "\n")
+            rsync_cmd = (
+                ["rsync"]
+                + RSYNC_OPTIONS
+                + COMPRESSION_OPTIONS[compression]
+                + ["--stats", "--no-h", "--files-from", files_from, base_path, destination_path]
+            )
+            processes.append(
+                subprocess.Popen(rsync_cmd, stdout=subprocess.PIPE, universal_newlines=True)
+            )
+
+        return_codes = []
+        total_bytes = 0
+        for index, process in enumerate(processes):
+            stdout, _ = process.communicate()
+            return_codes.append(process.returncode)
+            total_bytes += transferred_bytes(stdout)
+            print(f"shard {index}: {len(shards[index])} files, exit code {process.returncode}")
+
+    failed = [return_code for return_code in return_codes if return_code != 0]
+    print(
+        f"{base_path} -> {destination_path}: {len(files)} files in {len(shards)} streams, "
+        f"{total_bytes} bytes transferred, {len(failed)} failed streams"
+    )
+    return (failed[0] if failed else 0), total_bytes
+
+
+# Copy a source in several parallel rsync streams, returns (exit code, bytes transferred)
+def sharded_transfer(source_path, destination_path, streams, compression=DEFAULT_COMPRESSION):
+    files = list_source_files(source_path) if streams > 1 else None
+    if not files:
+        return transfer(source_path, destination_path, compression), None
+
+    base_path, _ = split_source(source_path)
+    return run_streams(base_path, destination_path, files, streams, compression)
+
+
+# Hash the start, middle and end of a file, with its size that catches almost every frame change
+def fast_hash(file_path, size):
+    digest = hashlib.blake2b(str(size).encode(), digest_size=16)
+    with open(file_path, "rb") as file:
+        for offset in sorted({0, max(0, size // 2 - HASH_SAMPLE_SIZE // 2), max(0, size - HASH_SAMPLE_SIZE)}):
+            file.seek(offset)
+            digest.update(file.read(HASH_SAMPLE_SIZE))
+    return digest.hexdigest()
+
+
+def load_manifest(manifest_file):
+    try:
+        with open(manifest_file) as file:
+            return json.load(file)["files"]
+    except (OSError, ValueError, KeyError):
+        return {}
+
+
+# Size, mtime and fast hash of every file under a folder, unchanged files keep their previous hash
+def build_manifest(folder, previous=None):
+    previous = previous or {}
+    files = dict()
+    for root, dirs, names in os.walk(folder):
+        for name in names:
+            file_path = os.path.join(root, name)
+            relative_path = os.path.relpath(file_path, folder)
+            if relative_path == MANIFEST_NAME:
+                continue
+            stat = os.stat(file_path)
+            entry = {"size": stat.st_size, "mtime": int(stat.st_mtime)}
+            old_entry = previous.get(relative_path)
+            if old_entry and (old_entry["size"], old_entry["mtime"]) == (entry["size"], entry["mtime"]):
+                entry["hash"] = old_entry["hash"]
+            else:
+                entry["hash"] = fast_hash(file_path, stat.st_size)
+            files[relative_path] = entry
+    return files
+
+
+def write_manifest(folder, files):
+    with tempfile.NamedTemporaryFile("w", dir=folder, suffix=".tmp", delete=False) as file:
+        json.dump({"files": files}, file)
+    os.chmod(file.name, 0o644)
+    os.replace(file.name, os.path.join(folder, MANIFEST_NAME))
+
+
+# Build or update the manifest stored inside a source folder, run where the folder is local
+def write_source_manifest(folder):
+    manifest_file = os.path.join(folder, MANIFEST_NAME)
+    files = build_manifest(folder, load_manifest(manifest_file))
+    write_manifest(folder, files)
+    return files
+
+
+# Files of the source manifest that are missing or different on the destination
+def changed_files(source_files, destination_folder):
+    destination_files = load_manifest(os.path.join(destination_folder, MANIFEST_NAME))
+    changed = []
+    for relative_path, entry in source_files.items():
+        try:
+            stat = os.stat(os.path.join(destination_folder, relative_path))
+        except OSError:
+            changed.append(relative_path)
+            continue
+        # A local stat proves the destination file is still the one its manifest describes
+        if (stat.st_size, int(stat.st_mtime)) != (entry["size"], entry["mtime"]):
+            changed.append(relative_path)
+            continue
+        destination_entry = destination_files.get(relative_path)
+        if destination_entry and destination_entry["hash"] != entry["hash"]:
+            changed.append(relative_path)
+    return changed
+
+
+# Send only the files that differ from the destination, returns (exit code, bytes transferred)
+def delta_transfer(source_path, destination_path, streams, compression=DEFAULT_COMPRESSION):
+    base_path, folder = split_source(source_path)
+    destination_folder = os.path.join(destination_path, folder)
+
+    with tempfile.TemporaryDirectory(prefix="rsync_manifest_") as manifest_dir:
+        fetch_cmd = ["rsync", "-e", "ssh", base_path + folder + MANIFEST_NAME, manifest_dir + "/"]
+        if subprocess.call(fetch_cmd) != 0:
+            print(f"No transfer manifest in {source_path}, sending everything")
+            return sharded_transfer(source_path, destination_path, streams, compression)
+        source_files = load_manifest(os.path.join(manifest_dir, MANIFEST_NAME))
+
+    changed = changed_files(source_files, destination_folder)
+    print(f"{source_path}: {len(changed)} of {len(source_files)} files changed")
+    if not changed:
+        return 0, 0
+
+    files = [(folder + relative_path, source_files[relative_path]["size"]) for relative_path in changed]
+    return_code, total_bytes = run_streams(base_path, destination_path, files, streams, compression)
+    if return_code == 0:
+        write_manifest(destination_folder, source_files)
+    return return_code, total_bytes
+
+
+# Read the source/destination pairs of one task of a batch transfer job, a pair may
+# carry the compression the submission chose for it as a third item
+def read_manifest_chunk(manifest_file, task):
+    with open(manifest_file) as file:
+        return json.load(file)["chunks"][task]
+
+
+def main(argv):
+    args = parse_args(argv)
+    # Batch job task: --manifest <manifest file> <task number>
+    if args.manifest:
+        pairs = read_manifest_chunk(args.manifest[0], int(args.manifest[1]))
+    else:
+        pairs = [args.pair.split(",")]
+
+    failed = 0
+    for pair in pairs:
+        source_path, destination_path = pair[:2]
+        compression = pair[2] if len(pair) > 2 else args.compression
+        if compression == "auto":
+            compression = choose_compression(source_path, args.compress_choice)
+        if args.delta:
+            return_code, _ = delta_transfer(source_path, destination_path, args.streams, compression)
+        elif args.streams > 1:
+            return_code, _ = sharded_transfer(source_path, destination_path, args.streams, compression)
+        else:
+            return_code = transfer(source_path, destination_path, compression)
+        if return_code != 0:
+            print(f"rsync failed with exit code {return_code}: {source_path} -> {destination_path}")
+            failed += 1
+
+    # A non zero exit code fails the Deadline task, so the chunk can be requeued
+    return 1 if failed else 0
 
-create_destination_directory(destination_path)
-rsync_cmd = ["rsync", "-avz", "-e", "ssh", source_path, destination_path]
-subprocess.call(rsync_cmd)
 
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,262 @@
+"""
+sg_cache.py:
+
+This module defines the MetadataCache class, a read-through cache for
+ ShotGrid data that rarely changes (departments, projects, project ids),
+   kept on disk between sessions and refreshed in the background.
+
+Classes:
+    MetadataCache:
+        A JSON backed cache whose entries expire after a TTL. Expired
+        entries are still served while a background thread reloads them.
+
+Functions:
+    get_metadata_cache():
+        Returns the cache shared by the whole tool.
+
+    department_names():
+        Returns the ShotGrid department names without underscores, sorted by length.
+
+    project_names():
+        Returns the names of the ShotGrid projects.
+
+    reload_project_names():
+        Loads the project names again now, e.g. for a show created today.
+
+    project_id(project_name):
+        Returns the id of a ShotGrid project.
+
+Usage:
+    shows = project_names()
+    departments = get_metadata_cache().get("departments", load_departments)
+"""
+
+
+import json
+import os
+import tempfile
+import threading
+import time
+
+
+DEFAULT_CACHE_PATH = os.path.join(
+    os.path.expanduser("~"), ".cache", "ingest_tool", "shotgrid_metadata.json"
+)
+# Departments and projects change about weekly, a day old copy is good enough
+DEFAULT_TTL = 24 * 60 * 60
+# A name missing from the cache reloads it at most this often, however often it is typed
+MIN_RELOAD_AGE = 60
+
+
+class MetadataCache:
+    """
+    Read-through cache for slow changing ShotGrid data.
+
+    A missing entry is loaded on the calling thread. An expired entry is
+    returned at once and reloaded on a background thread, so only the very
+    first launch waits for ShotGrid. A failed reload keeps the old value.
+
+    Attributes:
+        path (str): The JSON file the entries are persisted to.
+        ttl (float): Seconds after which an entry is reloaded.
+        entries (dict): Key to {"value": ..., "time": load time}.
+    """
+
+    def __init__(self, path=None, ttl=None):
+        """
+        Initialize the MetadataCache object.
+
+        Args:
+            path (str): The JSON file path, defaults to DEFAULT_CACHE_PATH.
+            ttl (float): Seconds an entry stays fresh, defaults to DEFAULT_TTL.
+        """
+        self.path = path or DEFAULT_CACHE_PATH
+        self.ttl = DEFAULT_TTL if ttl is None else ttl
+        self.entries = dict()
+        self._lock = threading.Lock()
+        self._refreshing = set()
+
+        try:
+            with open(self.path) as file:
+                self.entries = json.load(file)
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            print(f"Error: ShotGrid cache ignored - {e} for file: {self.path}")
+
+    def get(self, key, loader):
+        """
+        Return a cached value, loading it if it is missing.
+
+        Args:
+            key (str): The cache key.
+            loader (callable): Called without arguments to load the value,
+                the result must be JSON serialisable.
+
+        Returns:
+            The cached or freshly loaded value.
+        """
+        with self._lock:
+            entry = self.entries.get(key)
+
+        if entry is None:
+            return self._load(key, loader)
+
+        if time.time() - entry["time"] > self.ttl:
+            self.refresh(key, loader)
+        return entry["value"]
+
+    def reload(self, key, loader, min_age=0):
+        """
+        Load a value again on the calling thread, e.g. when a name is missing from it.
+
+        Args:
+            key (str): The cache key.
+            loader (callable): The loader of the value.
+            min_age (float): Seconds a value must be old before it is loaded again.
+
+        Returns:
+            The freshly loaded value, or the cached one if it is younger than
+            min_age or the load failed.
+        """
+        with self._lock:
+            entry = self.entries.get(key)
+
+        if entry is not None and time.time() - entry["time"] < min_age:
+            return entry["value"]
+        try:
+            return self._load(key, loader)
+        except Exception as e:
+            if entry is None:
+                raise
+            print(f"Error: ShotGrid cache reload failed - {e} for key: {key}")
+            return entry["value"]
+
+    def refresh(self, key, loader):
+        """
+        Reload a value on a background thread, unless a reload of it is already running.
+
+        Args:
+            key (str): The cache key.
+            loader (callable): The loader of the value.
+        """
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def reload():
+            try:
+                self._load(key, loader)
+            except Exception as e:
+                print(f"Error: ShotGrid cache refresh failed - {e} for key: {key}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=reload, daemon=True).start()
+
+    def _load(self, key, loader):
+        value = loader()
+        with self._lock:
+            self.entries[key] = {"value": value, "time": time.time()}
+            self._save()
+        return value
+
+    def _save(self):
+        # Written to a temporary file first, a crash never leaves half a cache
+        try:
+            directory = os.path.dirname(self.path)
+            os.makedirs(directory, exist_ok=True)
+            with tempfile.NamedTemporaryFile(
+                "w", dir=directory, suffix=".tmp", delete=False
+            ) as file:
+                json.dump(self.entries, file)
+            os.replace(file.name, self.path)
+        except (OSError, TypeError) as e:
+            print(f"Error: ShotGrid cache not saved - {e} for file: {self.path}")
+
+
+_metadata_cache = None
+_metadata_cache_lock = threading.Lock()
+
+
+def get_metadata_cache():
+    """
+    Return the MetadataCache shared by the whole tool.
+
+    Returns:
+        MetadataCache: The shared cache, created on first use.
+    """
+    global _metadata_cache
+    with _metadata_cache_lock:
+        if _metadata_cache is None:
+            _metadata_cache = MetadataCache()
+        return _metadata_cache
+
+
+def _load_department_names():
+    from sg_utils import read
+
+    departments = read._get_details("Department", [], ["name"])
+    filtered_departments = [
+        dept["name"] for dept in departments if "_" not in dept["name"]
+    ]
+    return sorted(filtered_departments, key=len)
+
+
+def _load_project_names():
+    from sg_utils import read
+
+    return [project["name"] for project in read.Projects().projects]
+
+
+def department_names():
+    """
+    Return the ShotGrid department names.
+
+    Returns:
+        list: The department names without underscores, sorted by length.
+    """
+    return get_metadata_cache().get("departments", _load_department_names)
+
+
+def project_names():
+    """
+    Return the ShotGrid project names.
+
+    Returns:
+        list: The project names.
+    """
+    return get_metadata_cache().get("projects", _load_project_names)
+
+
+def reload_project_names():
+    """
+    Load the ShotGrid project names now, bypassing the TTL.
+
+    Returns:
+        list: The project names, the cached ones if ShotGrid could not be read.
+    """
+    return get_metadata_cache().reload("projects", _load_project_names, MIN_RELOAD_AGE)
+
+
+def project_id(project_name):
+    """
+    Return the id of a ShotGrid project.
+
+    Args:
+        project_name (str): The ShotGrid project name.
+
+    Returns:
+        int: The project id.
+    """
+
+    def load_project_id():
+        from sg_utils import read
+
+        return read._get_details_one(
+            "Project", [["name", "is", project_name]], ["id"]
+        )["id"]
+
+    return get_metadata_cache().get("project_id:" + project_name, load_project_id)
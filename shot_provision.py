@@ -0,0 +1,95 @@
+"""
+shot_provision.py:
+
+This module defines the ShotProvisioner class, which creates the shot
+ folders and ShotGrid shots a publish needs once per shot instead of once
+   per published row.
+
+Classes:
+    ShotProvisioner:
+        Creates the unique (server, project, sequence, shot) tuples of a
+        publish concurrently and remembers them for the session.
+
+Usage:
+    provisioner = ShotProvisioner()
+    errors = provisioner.provision([("brahmos", "SHOW", "sq010", "sq010_sh0010")])
+"""
+
+
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+
+
+DEFAULT_MAX_WORKERS = 8
+
+
+def _create_shot(server_name, project_name, sequence, shot):
+    from jobsetup import new_shots as shots
+
+    return shots.create(server_name, project_name, sequence, shot, None, None)
+
+
+class ShotProvisioner:
+    """
+    Creates every shot of a publish once, concurrently.
+
+    One shot per sequence is created first, so two threads never create the
+    same sequence at once, then the remaining shots follow in parallel. Shots
+    created without an error are remembered, so later publishes of the
+    session skip them.
+
+    Attributes:
+        create_shot (callable): Called as create_shot(server, project, sequence, shot).
+        max_workers (int): The number of shots created at once.
+        provisioned (set): The (server, project, sequence, shot) tuples created this session.
+    """
+
+    def __init__(self, create_shot=None, max_workers=None):
+        """
+        Initialize the ShotProvisioner object.
+
+        Args:
+            create_shot (callable): The shot creation function, defaults to new_shots.create.
+            max_workers (int): The number of shots created at once.
+        """
+        self.create_shot = create_shot or _create_shot
+        self.max_workers = max_workers or DEFAULT_MAX_WORKERS
+        self.provisioned = set()
+        self._lock = threading.Lock()
+
+    def provision(self, shot_keys):
+        """
+        Create the shots that were not created yet this session.
+
+        Args:
+            shot_keys (iterable): (server, project, sequence, shot) tuples, duplicates are created once.
+
+        Returns:
+            dict: The tuples that failed, mapped to their exception.
+        """
+        with self._lock:
+            pending = sorted(set(shot_keys) - self.provisioned)
+        if not pending:
+            return {}
+
+        first_shots = dict()
+        for key in pending:
+            first_shots.setdefault(key[:3], key)
+        first_pass = list(first_shots.values())
+        second_pass = [key for key in pending if first_shots[key[:3]] != key]
+
+        errors = dict()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for keys in (first_pass, second_pass):
+                futures = [(key, executor.submit(self.create_shot, *key)) for key in keys]
+                for key, future in futures:
+                    try:
+                        future.result()
+                    except Exception as e:
+                        print(f"Error: Shot creation failed - {e} for shot: {key[3]}")
+                        errors[key] = e
+                        continue
+                    with self._lock:
+                        self.provisioned.add(key)
+        return errors
@@ -0,0 +1,160 @@
+"""
+table_rules.py:
+
+This module defines the TableClassifier class, which matches a screened
+ file sequence to the ingest table it belongs to.
+
+Classes:
+    TableClassifier:
+        Precompiles the "regex", "filter" and "extensions" rules of the
+        YAML "Table" config once and answers which table a file
+        name belongs to.
+
+Usage:
+    classifier = TableClassifier(yaml_data["Table"])
+    table_name, regex = classifier.classify("sq010_sh0010_bg01.1001-1100#.exr", True)
+"""
+
+
+import re
+
+
+class TableClassifier:
+    """
+    Matches file names to ingest tables with rules compiled once from the YAML "Table" config.
+
+    The tables are checked in reverse config order, exactly like the original
+    loop in ingest_file_screening.separate_the_ingest_files:
+
+    - a sequence matches a table if one of its filter tokens is in the lower
+      case file name, if its regex matches an exr name, or if it is a mov;
+    - a single file matches the first table listing its extension;
+    - otherwise the first table of the config is used when it lists the
+      extension, and "UnMatched" when it does not.
+
+    Attributes:
+        table_names (list): Table names in the order they are checked.
+        patterns (list): Compiled table regexes in the same order, None for tables without one.
+        extension_table (dict): Extension to the index of the first table that lists it.
+        filter_pattern (re.Pattern): A single lookahead pattern finding every filter token at once.
+        token_tables (dict): Filter token to the set of table indexes it (or any of its prefixes) hits.
+        always_filtered (set): Indexes of tables with an empty filter token, which matches any name.
+    """
+
+    def __init__(self, table_config):
+        """
+        Initialize the TableClassifier object.
+
+        Args:
+            table_config (dict): The "Table" section of the ingest YAML data.
+        """
+        self.table_names = []
+        self.patterns = []
+        self.extensions = []
+        self.extension_table = dict()
+        self.always_filtered = set()
+        tables_by_token = dict()
+
+        for index, (table_name, value) in enumerate(reversed(list(table_config.items()))):
+            regex = value.get("regex")
+            self.table_names.append(table_name)
+            self.patterns.append(re.compile(regex) if isinstance(regex, str) else None)
+            self.extensions.append(set(value.get("extensions") or []))
+
+            for extension in value.get("extensions") or []:
+                self.extension_table.setdefault(extension, index)
+
+            for token in value.get("filter") or []:
+                if token:
+                    tables_by_token.setdefault(token, set()).add(index)
+                else:
+                    self.always_filtered.add(index)
+
+        # The lookahead finds the longest token starting at every position of the
+        # name, so each token also carries the tables of the tokens it starts with
+        self.token_tables = {
+            token: set().union(
+                *(
+                    tables
+                    for other, tables in tables_by_token.items()
+                    if token.startswith(other)
+                )
+            )
+            for token in tables_by_token
+        }
+        self.filter_pattern = None
+        if tables_by_token:
+            tokens = sorted(tables_by_token, key=len, reverse=True)
+            self.filter_pattern = re.compile(
+                "(?=({}))".format("|".join(re.escape(token) for token in tokens))
+            )
+
+    def search(self, index, filename):
+        """
+        Run the regex of a table against a file name.
+
+        Args:
+            index (int): The table index in checking order.
+            filename (str): The file name to match.
+
+        Returns:
+            re.Match: The match object, or None.
+        """
+        pattern = self.patterns[index]
+        return pattern.search(filename) if pattern else None
+
+    def first_filtered_table(self, filename):
+        """
+        Find the first table whose filter tokens appear in the lower case file name.
+
+        Args:
+            filename (str): The file name to match.
+
+        Returns:
+            int: The table index in checking order, or None.
+        """
+        hits = set(self.always_filtered)
+        if self.filter_pattern:
+            for match in self.filter_pattern.finditer(filename.lower()):
+                hits.update(self.token_tables[match.group(1)])
+        return min(hits) if hits else None
+
+    def classify(self, filename, is_sequence):
+        """
+        Find the ingest table for a file name.
+
+        Args:
+            filename (str): The base name of the file sequence, e.g. "plate.1001-1100#.exr".
+            is_sequence (bool): True when the sequence has more than one frame.
+
+        Returns:
+            tuple: (table_name, regex) where regex is the table's regex match
+                passed on to build_ingest_data, or None.
+        """
+        extension = filename.split(".")[-1].lower()
+
+        if not is_sequence:
+            index = self.extension_table.get(extension)
+            if index is None:
+                return "UnMatched", None
+            return self.table_names[index], self.search(index, filename)
+
+        if extension == "mov":
+            return self.table_names[0], self.search(0, filename)
+
+        index = self.first_filtered_table(filename)
+        if extension == "exr":
+            # A regex hit only counts for tables checked before the first filter hit
+            for regex_index in range(len(self.table_names) if index is None else index):
+                regex = self.search(regex_index, filename)
+                if regex:
+                    return self.table_names[regex_index], regex
+
+        if index is not None:
+            return self.table_names[index], self.search(index, filename)
+
+        # Nothing matched, fall back on the first table of the config
+        last = len(self.table_names) - 1
+        if extension in self.extensions[last]:
+            return self.table_names[last], self.search(last, filename)
+        return "UnMatched", None
@@ -0,0 +1,187 @@
+"""
+version_index.py:
+
+This module defines the PublishedVersionIndex class, which answers the
+ latest published version under a destination path without scanning
+   every PublishedFile of the project, and the PublishedVersionQuery class,
+     which fetches only the PublishedFiles those paths need.
+
+Classes:
+    PublishedVersionIndex:
+        Maps every path prefix that is followed by a "v###" folder or
+        file name to the highest version published under it.
+
+    PublishedVersionQuery:
+        Queries ShotGrid for the published paths starting with a set of
+        destination paths, in batched filters.
+
+Usage:
+    query = PublishedVersionQuery("show")
+    index = query.resolve(["/brahmos/projects/SHOW/shots/sq010/sh0010/plate/"])
+    version = index.next_version("/brahmos/projects/SHOW/shots/sq010/sh0010/plate/")
+"""
+
+
+import re
+
+
+VERSION_PATTERN = re.compile(r"[\\/]v(\d+)")
+
+# Destination paths sent in one "any" filter, keeps every result small
+DEFAULT_BATCH_SIZE = 50
+
+
+class PublishedVersionIndex:
+    """
+    Highest published version per path prefix.
+
+    Every "/v###" in a published path registers the path up to and including
+    its separator as a prefix, so the lookup for a destination path cut
+    before "{Version}" is a single dict access. Destination paths that do
+    not end on a separator are answered by scanning the published paths the
+    way ValidateTableData used to.
+
+    Attributes:
+        prefix_versions (dict): Path prefix to the highest version number found after it.
+        filepaths (list): Every indexed published path, kept for the scanning fallback.
+    """
+
+    def __init__(self, filepaths=()):
+        """
+        Initialize the PublishedVersionIndex object.
+
+        Args:
+            filepaths (iterable): Published file paths ("sg_filepath" values) to index.
+        """
+        self.prefix_versions = dict()
+        self.filepaths = []
+        for filepath in filepaths:
+            self.add(filepath)
+
+    def add(self, filepath):
+        """
+        Index one published file path.
+
+        Args:
+            filepath (str): A published "sg_filepath", empty values are ignored.
+        """
+        if not filepath:
+            return
+
+        self.filepaths.append(filepath)
+        for match in VERSION_PATTERN.finditer(filepath):
+            prefix = filepath[: match.start() + 1]
+            version = int(match.group(1))
+            if version > self.prefix_versions.get(prefix, -1):
+                self.prefix_versions[prefix] = version
+
+    def latest_version(self, file_path):
+        """
+        Return the highest version published under a destination path.
+
+        Args:
+            file_path (str): The destination path cut before "{Version}".
+
+        Returns:
+            int: The highest version number, 0 if nothing was published yet.
+        """
+        if file_path.endswith(("/", "\\")):
+            return self.prefix_versions.get(file_path, 0)
+
+        versions = [
+            int(match.group(1))
+            for match in (
+                VERSION_PATTERN.search(filepath)
+                for filepath in self.filepaths
+                if file_path in filepath
+            )
+            if match
+        ]
+        return max(versions or [0])
+
+    def next_version(self, file_path):
+        """
+        Return the version string to publish under a destination path.
+
+        Args:
+            file_path (str): The destination path cut before "{Version}".
+
+        Returns:
+            str: The next version, e.g. "v004".
+        """
+        return "v" + str(self.latest_version(file_path) + 1).zfill(3)
+
+
+def _find_published_files(entity_type, filters, fields):
+    from sg_utils import read
+
+    return read._get_details(entity_type, filters, fields)
+
+
+class PublishedVersionQuery:
+    """
+    Fetches the published paths under a set of destination paths.
+
+    Instead of every PublishedFile of the project, only records whose
+    sg_filepath starts with one of the distinct destination paths are
+    requested, with "sg_filepath" as the only field. The paths are sent as
+    "starts_with" filters joined by "any", one find per batch of paths, so
+    the result of every find only covers the rows of that batch.
+
+    Attributes:
+        project_name (str): The ShotGrid project name.
+        finder (callable): Called as finder(entity_type, filters, fields) and
+            returns a list of record dicts, like read._get_details.
+        batch_size (int): The number of destination paths per filter.
+    """
+
+    def __init__(self, project_name, finder=None, batch_size=None):
+        """
+        Initialize the PublishedVersionQuery object.
+
+        Args:
+            project_name (str): The ShotGrid project name.
+            finder (callable): The ShotGrid find function, defaults to read._get_details.
+            batch_size (int): The number of destination paths per filter.
+        """
+        self.project_name = project_name
+        self.finder = finder or _find_published_files
+        self.batch_size = batch_size or DEFAULT_BATCH_SIZE
+
+    def filepaths(self, file_paths):
+        """
+        Yield the published paths starting with any of the destination paths.
+
+        Args:
+            file_paths (iterable): Destination paths, duplicates are queried once.
+
+        Yields:
+            str: Published "sg_filepath" values, a batch is requested as it is consumed.
+        """
+        prefixes = sorted(set(file_paths))
+        for start in range(0, len(prefixes), self.batch_size):
+            filters = [
+                ["project.Project.name", "is", self.project_name],
+                {
+                    "filter_operator": "any",
+                    "filters": [
+                        ["sg_filepath", "starts_with", prefix]
+                        for prefix in prefixes[start : start + self.batch_size]
+                    ],
+                },
+            ]
+            for record in self.finder("PublishedFile", filters, ["sg_filepath"]):
+                if record.get("sg_filepath"):
+                    yield record["sg_filepath"]
+
+    def resolve(self, file_paths):
+        """
+        Build a version index covering the given destination paths.
+
+        Args:
+            file_paths (iterable): The destination paths cut before "{Version}".
+
+        Returns:
+            PublishedVersionIndex: The index to call next_version() on.
+        """
+        return PublishedVersionIndex(self.filepaths(file_paths))